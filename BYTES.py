@@ -55,3 +55,537 @@ morezeroes = zeroes + zeroes + zeroes
 bytes7 = bytes5 + bytes6
 
 print(zeroes, bytes1, bytes2, bytes3, bytes4, bytes5, bytes6)
+
+
+# Streaming transcoding with incremental codecs
+# message.decode() needs the whole input in memory, and so does the decoded str (up to 4 bytes
+# per character). For a multi-GB file, read fixed-size chunks into one reused bytearray instead and
+# feed them to an incremental decoder. It keeps the bytes of a character that's cut at a chunk edge
+# (UTF-8 uses 1 to 4 bytes per character) and finishes it with the next chunk.
+# A BOM at the start of the input names its encoding, so it wins over a declared UTF encoding (or
+# encoding=None, which means "UTF-8 unless there's a BOM"), and it isn't part of the text. A declared
+# non-UTF encoding is used as is: in latin-1, b'\xff\xfe' is just 'ÿþ'. On output, 'utf-16' and 'utf-32' are written as their little-endian
+# variants (like 'utf-16-le', no BOM) and a BOM is only added when asked for, or when the target
+# is 'utf-8-sig', whose name asks for one.
+import codecs
+
+_BOMS = [                                          # Longest first: UTF-32-LE's BOM starts with UTF-16-LE's
+    (codecs.BOM_UTF32_LE, 'utf-32-le'), (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+_NO_BOM = {'utf-8-sig': 'utf-8', 'utf-16': 'utf-16-le', 'utf-32': 'utf-32-le'}
+
+def transcode(src, dst, encoding='utf-8', to='utf-8', add_bom=False, chunk_size=1 << 16):
+    """Copy binary file src to binary file dst, re-encoded. Returns the input encoding used."""
+    add_bom = add_bom or codecs.lookup(to).name == 'utf-8-sig'
+    to = _NO_BOM.get(codecs.lookup(to).name, to)
+    boms = {name: bom for bom, name in _BOMS}
+    if add_bom and codecs.lookup(to).name not in boms:
+        raise ValueError(f'{to!r} has no byte order mark; add_bom needs a UTF encoding')
+    head = b''
+    if encoding is None or codecs.lookup(encoding).name.startswith('utf'):
+        while len(head) < 4 and (more := src.read(4 - len(head))):   # Pipes may return less
+            head += more
+        encoding = encoding or 'utf-8'
+        for bom, name in _BOMS:
+            if head.startswith(bom):
+                encoding, head = name, head[len(bom):]
+                break
+    encoding = _NO_BOM.get(codecs.lookup(encoding).name, encoding)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    encoder = codecs.getincrementalencoder(to)()
+    if add_bom:
+        dst.write(boms[codecs.lookup(to).name])
+    dst.write(encoder.encode(decoder.decode(head)))
+    buffer = bytearray(chunk_size)                 # Allocated once, refilled by readinto()
+    view = memoryview(buffer)
+    while n := src.readinto(buffer):
+        dst.write(encoder.encode(decoder.decode(view[:n])))
+    dst.write(encoder.encode(decoder.decode(b'', final=True), final=True))
+    return encoding
+
+import io
+greek = 'Γειά σου κόσμε!'
+out = io.BytesIO()
+print(transcode(io.BytesIO(greek.encode('utf-16')), out, chunk_size=3))  # utf-16-le, from the BOM
+print(out.getvalue().decode())     # Γειά σου κόσμε!. Characters split across 3-byte chunks survive
+out = io.BytesIO()
+transcode(io.BytesIO(b'abc'), out, to='utf-16')
+print(out.getvalue())              # b'a\x00b\x00c\x00'. Like 'utf-16-le': no BOM unless asked
+out = io.BytesIO()
+transcode(io.BytesIO(b'abc'), out, to='utf-16', add_bom=True)
+print(out.getvalue())              # b'\xff\xfea\x00b\x00c\x00'. Same as bytes('abc', 'utf-16')
+out = io.BytesIO()
+transcode(io.BytesIO(b'abc'), out, to='utf-8-sig')
+print(out.getvalue())              # b'\xef\xbb\xbfabc'. Same as 'abc'.encode('utf-8-sig')
+out = io.BytesIO()
+transcode(io.BytesIO('ÿþ 9€'.encode('cp1252')), out, encoding='cp1252')
+print(out.getvalue().decode())     # ÿþ 9€. Not a BOM: the declared encoding isn't a UTF one
+# From stdin to stdout: transcode(sys.stdin.buffer, sys.stdout.buffer, 'utf-16', 'utf-8')
+
+# Benchmark: UTF-16 file to UTF-8 file. read().decode() holds the whole file twice over (bytes and
+# str); transcode() holds one chunk. The gap in peak memory grows with the file, the time doesn't.
+import os, tempfile, time, tracemalloc
+with tempfile.TemporaryDirectory() as tmp:
+    source, target = os.path.join(tmp, 'in.txt'), os.path.join(tmp, 'out.txt')
+    with open(source, 'wb') as f:
+        f.write((greek * 200_000).encode('utf-16'))
+    def whole():
+        with open(source, 'rb') as f, open(target, 'wb') as g:
+            g.write(f.read().decode('utf-16').encode('utf-8'))
+    def streamed():
+        with open(source, 'rb', buffering=0) as f, open(target, 'wb') as g:
+            transcode(f, g)
+    for func in whole, streamed:
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size = os.path.getsize(source)
+        print(f'{func.__name__:>8}: {size / elapsed / 2**20:.0f} MiB/s, peak {peak / 2**20:.2f} MiB for {size / 2**20:.1f} MiB')
+
+
+# Building bytes without repeated +
+# Bytes are immutable, so a + b makes a new object and copies both sides into it. Assembling a message
+# with msg = msg + part in a loop copies everything built so far on every step: O(n**2) bytes copied.
+# b''.join(parts) copies each part once, into one allocation sized up front. BytesBuilder below keeps
+# references to the parts (bytes as they are, anything else as a memoryview), lets you slice across
+# parts without copying, and either joins them once at the end or hands them straight to os.writev(),
+# so they're never joined at all. Nothing is copied: don't modify a bytearray after appending it.
+import os
+from bisect import bisect_right
+from itertools import accumulate
+
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')             # Most parts one writev() call takes
+except (AttributeError, ValueError, OSError):      # No sysconf (Windows), or it doesn't know the name
+    IOV_MAX = -1
+if IOV_MAX <= 0:                                   # -1: no fixed limit
+    IOV_MAX = 1024
+
+class BytesBuilder:
+    def __init__(self, parts=()):
+        self._parts, self._ends = [], []           # _ends[i]: offset where part i ends
+        self.extend(parts)
+
+    def append(self, data):
+        self.extend((data,))
+
+    def extend(self, parts):
+        parts = list(parts)
+        if set(map(type, parts)) - {bytes}:        # bytes are kept as they are, others are viewed
+            parts = [p if type(p) is bytes else memoryview(p).cast('B') for p in parts]
+        n = len(self._ends)
+        self._parts += parts
+        self._ends += accumulate(map(len, parts), initial=len(self))  # C loops, no bytecode per part
+        del self._ends[n]                          # accumulate() starts with the initial value itself
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            index += len(self) if index < 0 else 0
+            if not 0 <= index < len(self):
+                raise IndexError('BytesBuilder index out of range')
+            i = bisect_right(self._ends, index)
+            return self._parts[i][index - (self._ends[i] - len(self._parts[i]))]
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return BytesBuilder([self.build()[index]])
+        result = BytesBuilder()
+        i = bisect_right(self._ends, start)
+        while start < stop:                        # Slices of the parts, still no copy
+            begin = self._ends[i] - len(self._parts[i])
+            result.append(memoryview(self._parts[i])[start - begin:min(stop, self._ends[i]) - begin])
+            start, i = self._ends[i], i + 1
+        return result
+
+    def build(self):
+        return b''.join(self._parts)               # One allocation, each byte copied once
+
+    def write_to(self, file):
+        """Write every part to a file object, a connected socket or a descriptor with os.writev,
+        without joining them."""
+        if hasattr(file, 'flush'):
+            file.flush()                           # What's in the file object's buffer goes first
+        fd = file if isinstance(file, int) else file.fileno()
+        if not hasattr(os, 'writev'):              # Windows, where os.write() can't take a socket
+            send = file.sendall if hasattr(file, 'sendall') else lambda part: os.write(fd, part)
+            for part in self._parts:
+                send(part)
+            return
+        parts, i = self._parts[:], 0
+        while i < len(parts):
+            written = os.writev(fd, parts[i:i + IOV_MAX])
+            while i < len(parts) and written >= len(parts[i]):  # Skip what was written
+                written -= len(parts[i])
+                i += 1
+            if written:                            # A part was written partially
+                parts[i] = memoryview(parts[i])[written:]
+
+zeroes = bytes(5)
+builder = BytesBuilder([zeroes, zeroes, zeroes])   # Instead of zeroes + zeroes + zeroes
+builder.append(bytes('abc', 'utf-16'))
+builder.append('abc'.encode('utf-16-le'))
+print(len(builder), builder.build() == zeroes * 3 + bytes('abc', 'utf-16') + 'abc'.encode('utf-16-le'))  # 29 True
+print(builder[13:21].build())      # b'\x00\x00\xff\xfea\x00b\x00'. A slice across two parts, built on demand
+print(builder[15])                 # 255. Indexing gives ints, like bytes
+
+import tempfile
+with tempfile.TemporaryFile() as f:
+    builder.write_to(f)            # One writev() system call, no join
+    f.seek(0)
+    print(f.read() == builder.build())  # True
+import socket
+left, right = socket.socketpair()
+with left, right:
+    builder.write_to(left)         # A connected socket works the same way
+    print(right.recv(64) == builder.build())  # True
+
+# Benchmark: assemble n small parts into one bytes object. Add 10**6 to the sizes for the full picture.
+import io
+from timeit import timeit
+def plus(parts):
+    msg = b''
+    for part in parts:
+        msg = msg + part
+    return msg
+def bytesio(parts):
+    buf = io.BytesIO()
+    for part in parts:
+        buf.write(part)
+    return buf.getvalue()
+def builder_build(parts):
+    return BytesBuilder(parts).build()
+for n in 10**3, 10**4, 10**5:
+    parts = [b'%08d,' % i for i in range(n)]
+    funcs = [b''.join, bytesio, builder_build] + ([plus] if n <= 10**4 else [])  # + is O(n**2)
+    times = ', '.join(f'{f.__name__} {timeit(lambda: f(parts), number=3) / 3 * 1e3:.2f} ms' for f in funcs)
+    print(f'{n:>7} parts: {times}')
+
+# Writing to a file: join then write, against writev straight from the parts. writev() pays off when
+# the parts are big (it saves copying them); for many tiny parts, joining them first is faster.
+big_parts = [bytes(64 * 1024)] * 256           # 16 MiB in 64 KiB parts
+with tempfile.TemporaryFile() as f:
+    builder = BytesBuilder(big_parts)
+    joined = timeit(lambda: (f.seek(0), f.write(b''.join(big_parts))), number=3) / 3
+    writev = timeit(lambda: (f.seek(0), builder.write_to(f)), number=3) / 3
+    print(f'16 MiB to a file: join + write {joined * 1e3:.2f} ms, write_to {writev * 1e3:.2f} ms')
+
+
+# Searching files larger than memory with mmap
+# bytes shares find, count, split, splitlines, startswith and friends with str, but they need the
+# whole file in memory first. mmap maps the file into the address space instead: the OS pages it in
+# as it's read and drops the pages again under memory pressure. An mmap already has find() and rfind().
+# MappedBytes adds the rest: count() block by block, lazy split()/splitlines() that yield
+# memoryview slices of the mapping (no copies), and a parallel count()/find() that cuts the file into
+# one piece per process at line boundaries. Processes are forked, so that part needs Linux or macOS.
+import mmap, multiprocessing, os
+
+class MappedBytes:
+    BLOCK = 1 << 24                                # 16 MiB per count() block
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:                # The mapping stays valid after the file is closed
+            size = os.fstat(f.fileno()).st_size
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self): return len(self._data)
+    def __getitem__(self, index): return memoryview(self._data)[index]   # Slices are views
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+    def close(self):
+        """Unmap the file. Afterwards it reads as empty. Views still in use keep the mapping alive:
+        it goes when the last of them is released."""
+        data, self._data = self._data, b''
+        if isinstance(data, mmap.mmap):
+            try:
+                data.close()
+            except BufferError:                    # Views are still using it
+                pass
+
+    def _indices(self, start, end):                # Negative and out-of-range indices, as for slices
+        return slice(start, end).indices(len(self))[:2]
+
+    def find(self, sub, start=0, end=None, jobs=1):
+        end = len(self) if end is None else end
+        if jobs > 1 and sub:
+            start, end = self._indices(start, end)
+            hits = [i for i in self._parallel(_find_range, sub, start, end, jobs) if i >= 0]
+            return min(hits, default=-1)
+        return self._data.find(sub, start, end)
+
+    def rfind(self, sub, start=0, end=None):
+        return self._data.rfind(sub, start, len(self) if end is None else end)
+
+    def startswith(self, prefix): return self[:len(prefix)] == prefix
+    def endswith(self, suffix): return len(suffix) <= len(self) and self[len(self) - len(suffix):] == suffix
+
+    def count(self, sub, start=0, end=None, jobs=1):
+        """Non-overlapping occurrences of sub in [start, end), like bytes.count."""
+        if not sub:                                # Like bytes: one match at every position, both ends included
+            end = len(self) if end is None else end
+            start, end = (max(i + len(self), 0) if i < 0 else i for i in (start, min(end, len(self))))
+            return max(end - start + 1, 0)
+        start, end = self._indices(start, end)
+        if any(sub[:k] == sub[-k:] for k in range(1, len(sub))):
+            return self._count_sequential(sub, start, end)   # e.g. b'aa': matches can overlap
+        if jobs > 1:
+            return sum(self._parallel(_count_range, sub, start, end, jobs))
+        return _count_range(self._data, sub, start, end, end)
+
+    def _count_sequential(self, sub, start, end):
+        n, pos = 0, self._data.find(sub, start, end)
+        while pos >= 0:
+            n += 1
+            pos = self._data.find(sub, pos + len(sub), end)
+        return n
+
+    def _parallel(self, func, sub, start, end, jobs):
+        cuts = [start]                             # One piece per process, cut after a newline
+        for k in range(1, jobs):
+            nl = self._data.find(b'\n', max(cuts[-1], start + (end - start) * k // jobs), end)
+            if nl < 0:
+                break
+            cuts.append(nl + 1)
+        cuts.append(end)
+        ctx = multiprocessing.get_context('fork')  # Children inherit the mapping; nothing is pickled
+        pipes, procs = [], []
+        for a, b in zip(cuts, cuts[1:]):
+            receive, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=lambda a=a, b=b, send=send: send.send(func(self._data, sub, a, b, end)))
+            proc.start()
+            pipes.append(receive)
+            procs.append(proc)
+        results = [pipe.recv() for pipe in pipes]
+        for proc in procs:
+            proc.join()
+        return results
+
+    def split(self, sep=b'\n'):
+        """Lazily yield memoryview slices between occurrences of sep."""
+        if not sep:
+            raise ValueError('empty separator')
+        return self._split(sep)
+
+    def _split(self, sep):
+        view, pos = memoryview(self._data), 0
+        while (hit := self._data.find(sep, pos)) >= 0:
+            yield view[pos:hit]
+            pos = hit + len(sep)
+        yield view[pos:]
+
+    def splitlines(self, keepends=False):
+        """Lazily yield lines ending in \\n or \\r\\n as memoryview slices, like bytes.splitlines()."""
+        view, pos, size = memoryview(self._data), 0, len(self)
+        while pos < size:
+            hit = self._data.find(b'\n', pos)
+            stop = size if hit < 0 else hit + 1
+            end = stop if keepends else stop - (hit >= 0) - (hit > pos and self._data[hit - 1] == 13)
+            yield view[pos:end]
+            pos = stop
+
+def _count_range(data, sub, start, stop, end):    # Matches that start in [start, stop), end by end
+    n, stop = 0, min(stop, len(data))
+    for a in range(start, stop, MappedBytes.BLOCK):
+        b = min(a + MappedBytes.BLOCK, stop)
+        # The block reaches len(sub) - 1 bytes past b, so a match can't be split between blocks,
+        # and only matches that start before b fit in it
+        n += data[a:min(b + len(sub) - 1, end)].count(sub)
+    return n
+
+def _find_range(data, sub, start, stop, end):
+    return data.find(sub, start, min(stop + len(sub) - 1, end))
+
+import tempfile
+with tempfile.NamedTemporaryFile(delete=False) as f:
+    f.write(b'INFO start\r\nERROR disk full\nINFO retry\nERROR disk full\n')
+with MappedBytes(f.name) as log:
+    print(log.count(b'ERROR'), log.find(b'retry'), log.rfind(b'ERROR'))  # 2 33 39
+    print([bytes(line) for line in log.splitlines()])  # [b'INFO start', b'ERROR disk full', ...]
+    print([bytes(field) for field in log.split(b' ')][:3])  # [b'INFO', b'start\r\nERROR', b'disk']
+    print(log.startswith(b'INFO'), bytes(log[5:10]))    # True b'start'
+    print(log.count(b'ERROR', jobs=2), log.find(b'retry', jobs=2))  # 2 33. Same answers, two processes
+os.remove(f.name)
+
+# Benchmark: count and find in a log file, against reading it all and using bytes methods.
+# The notes use 8 MiB to run quickly; the point is that MappedBytes works the same on files larger
+# than RAM, where read() isn't an option.
+import time, tracemalloc
+lines = b''.join(b'INFO request %d ok\n' % i for i in range(50_000))
+with tempfile.NamedTemporaryFile(delete=False) as f:
+    for _ in range(8 * 2**20 // len(lines)):
+        f.write(lines)
+    f.write(b'ERROR last line\n')
+def timed(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed, peak = time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{label:<28} {elapsed * 1e3:7.1f} ms, peak {peak / 2**20:5.1f} MiB  {result}')
+def read_all(method, *args):
+    with open(f.name, 'rb') as g:
+        return getattr(g.read(), method)(*args)
+with MappedBytes(f.name) as log:
+    jobs = min(4, os.cpu_count() or 1)
+    timed('read() + bytes.count', lambda: read_all('count', b'ok\n'))
+    timed('MappedBytes.count', lambda: log.count(b'ok\n'))
+    timed(f'MappedBytes.count, {jobs} jobs', lambda: log.count(b'ok\n', jobs=jobs))
+    timed('read() + bytes.find', lambda: read_all('find', b'ERROR'))
+    timed('MappedBytes.find', lambda: log.find(b'ERROR'))
+    timed(f'MappedBytes.find, {jobs} jobs', lambda: log.find(b'ERROR', jobs=jobs))
+os.remove(f.name)
+
+
+# Hex in bulk: streaming hex(), fromhex() and a hexdump
+# hex() and fromhex() are fast, but calling them once per packet or per line spends most of the time on
+# the call and the small objects around it. The functions below read big chunks into one reused
+# bytearray and convert a whole chunk per call with binascii, which gives bytes (ready to write) where
+# hex() gives str. hex_stream() groups like bytes.hex(sep, bytes_per_sep), counting groups from the
+# right when bytes_per_sep > 0; for that it needs the input size, so a stream that can't seek is
+# grouped from the left. unhex_stream() skips whitespace and separators, like fromhex(). hexdump()
+# formats thousands of lines per step, one column at a time, without a Python loop per line.
+import binascii, os, sys
+from array import array
+
+def _readfull(src, view):                          # readinto() may return less than asked, e.g. on pipes
+    n = 0
+    while n < len(view) and (got := src.readinto(view[n:])):
+        n += got
+    return n
+
+def hex_stream(src, dst, sep='', bytes_per_sep=1, chunk_size=1 << 20):
+    """Write the hex of binary file src to binary file dst, like dst.write(src.read().hex(sep, bytes_per_sep).encode())."""
+    if not bytes_per_sep:
+        sep = ''                                   # Like hex(): 0 bytes per separator means none
+    group = abs(bytes_per_sep) if sep else 1
+    buffer = bytearray(max(chunk_size // group, 1) * group)   # Chunks hold whole groups
+    view = memoryview(buffer)
+    first = len(view)
+    if sep and bytes_per_sep > 0 and src.seekable():   # The short group is the first one
+        here = src.tell()
+        first = (src.seek(0, os.SEEK_END) - here) % group or len(view)
+        src.seek(here)
+    sep = sep.encode() if isinstance(sep, str) else sep
+    n, started = _readfull(src, view[:first]), False
+    while n:
+        if started and sep:
+            dst.write(sep)                         # The separator between this chunk and the last
+        dst.write(binascii.b2a_hex(view[:n], sep, -group) if sep else binascii.b2a_hex(view[:n]))
+        n, started = _readfull(src, view), True
+
+def unhex_stream(src, dst, chunk_size=1 << 20, sep=b''):
+    """Write the bytes for the hex text in binary file src to dst. Whitespace and sep are skipped."""
+    skip = b' \t\n\r\v\f' + (sep.encode() if isinstance(sep, str) else sep)
+    buffer, carry = bytearray(chunk_size), b''
+    view = memoryview(buffer)
+    while n := src.readinto(buffer):
+        digits = carry + view[:n].tobytes().translate(None, skip)   # translate() deletes in C
+        even = len(digits) & ~1                    # A digit pair may be cut at the chunk edge
+        dst.write(binascii.a2b_hex(digits[:even]))
+        carry = digits[even:]
+    if carry:
+        raise ValueError('odd number of hex digits')
+
+_PRINTABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+
+def _hex_width(width):                            # 3 characters per byte, 1 more between groups of 8
+    return width * 3 - 1 + (width - 1) // 8
+
+def _dump_block(block, width, offset):
+    """Format full lines of hexdump -C output. Every line has the same layout, so each column of
+    the output is filled for all lines at once with one strided slice assignment."""
+    lines, column = len(block) // width, _hex_width(width)
+    digits = max(8, len(f'{offset:x}'))            # At least 8 digits, more past 4 GiB
+    if len(f'{offset + (lines - 1) * width:x}') > digits:   # The offsets get wider in this block:
+        split = (16 ** digits - offset + width - 1) // width * width   # format each part on its own
+        return _dump_block(block[:split], width, offset) + _dump_block(block[split:], width, offset + split)
+    size = digits + 2 + column + 3 + width + 2     # '00000010  20 61 ... 67  6c ... 65  |....|\n'
+    out = bytearray(b' ' * (size * lines))
+    offsets = array('Q', range(offset, offset + len(block), width))
+    if sys.byteorder == 'little':
+        offsets.byteswap()                         # Big-endian, so hex digits come out in order
+    offsets = binascii.b2a_hex(offsets)            # 16 digits per line
+    for i in range(digits):
+        out[i::size] = offsets[16 - digits + i::16]
+    hexed, start = binascii.b2a_hex(block), digits + 2
+    for i in range(width):                         # Both digits of the i-th byte of every line
+        at = start + 3 * i + i // 8
+        out[at::size] = hexed[2 * i::2 * width]
+        out[at + 1::size] = hexed[2 * i + 1::2 * width]
+    start += column + 2
+    out[start::size] = b'|' * lines
+    gutter = block.tobytes().translate(_PRINTABLE)
+    for i in range(width):
+        out[start + 1 + i::size] = gutter[i::width]
+    out[start + 1 + width::size] = b'|' * lines
+    out[size - 1::size] = b'\n' * lines
+    return out.decode('ascii')
+
+def hexdump(data, width=16, offset=0, lines=4096):
+    """Yield blocks of text in the line format of hexdump -C: offset, hex bytes, ASCII gutter.
+    Unlike hexdump -C, repeated lines aren't folded into '*' and there's no closing offset line.
+    data is bytes-like or a binary file; each block holds up to `lines` lines."""
+    if hasattr(data, 'readinto'):
+        view = memoryview(bytearray(width * lines))
+        while n := _readfull(data, view):
+            yield from hexdump(view[:n], width, offset, lines)
+            offset += n
+        return
+    view = memoryview(data).cast('B')
+    for start in range(0, len(view), width * lines):
+        block = view[start:start + width * lines]
+        full = len(block) - len(block) % width
+        if full:
+            yield _dump_block(block[:full], width, offset + start)
+        if rest := block[full:]:                   # A short last line, padded
+            gutter = rest.tobytes().translate(_PRINTABLE).decode('ascii')
+            hexed = '  '.join(rest[i:i + 8].hex(' ') for i in range(0, len(rest), 8))
+            yield f'{offset + start + full:08x}  {hexed:<{_hex_width(width)}}  |{gutter}|\n'
+
+import io
+out = io.BytesIO()
+hex_stream(io.BytesIO(b'\xb9\x01\xef\x02\x03'), out, ':', 2, chunk_size=2)
+print(out.getvalue(), b'\xb9\x01\xef\x02\x03'.hex(':', 2))  # b'b9:01ef:0203' b9:01ef:0203. Same grouping
+out = io.BytesIO()
+unhex_stream(io.BytesIO(b'b9:01ef:0203\n'), out, chunk_size=3, sep=':')
+print(out.getvalue())              # b'\xb9\x01\xef\x02\x03'
+print(''.join(hexdump(b'Hello, bytes!\x00\x01\xff at a glance')), end='')
+# 00000000  48 65 6c 6c 6f 2c 20 62  79 74 65 73 21 00 01 ff  |Hello, bytes!...|
+# 00000010  20 61 74 20 61 20 67 6c  61 6e 63 65              | at a glance|
+
+# Benchmark: 2 MiB of 64-byte packets, hexed one hex() call per packet and streamed, then dumped
+# with a per-line loop and with hexdump(). The rates hold for captures in the GB range.
+import tempfile, time
+mib = 2
+with tempfile.TemporaryDirectory() as tmp:
+    source, target = os.path.join(tmp, 'capture.bin'), os.path.join(tmp, 'out.txt')
+    with open(source, 'wb') as f:
+        f.write(os.urandom(mib * 2**20))
+    def per_packet():
+        with open(source, 'rb') as f, open(target, 'w') as g:
+            while packet := f.read(64):
+                g.write(packet.hex(' '))
+                g.write(' ')
+    def streamed():
+        with open(source, 'rb') as f, open(target, 'wb') as g:
+            hex_stream(f, g, ' ')
+    def dump_per_line():
+        with open(source, 'rb') as f, open(target, 'w') as g:
+            offset = 0
+            while line := f.read(16):
+                gutter = ''.join(chr(b) if 32 <= b < 127 else '.' for b in line)
+                g.write(f'{offset:08x}  {line[:8].hex(" ")}  {line[8:].hex(" "):<23}  |{gutter}|\n')
+                offset += 16
+    def dump_blocks():
+        with open(source, 'rb') as f, open(target, 'w') as g:
+            g.writelines(hexdump(f))
+    for func in per_packet, streamed, dump_per_line, dump_blocks:
+        start = time.perf_counter()
+        func()
+        print(f'{func.__name__:>13}: {mib / (time.perf_counter() - start):7.1f} MiB/s')
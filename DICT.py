@@ -155,7 +155,475 @@ print(merged1 == merged2 == merged3 == merged4 == merged5)
 print(merged1)
 print(chain6)
 # Conclusion. Use update and pipe depending on version. ChainMap has its own uses.
+# For numbers on your own Python version, run bench_dict_merge.py (time, peak memory, lookup cost).
+
+
+
+# A flattened ChainMap for hot lookups
+# ChainMap looks a key up in each map in turn, so a key from the last of 30 config layers costs 30
+# lookups, and so does every miss. FastChainMap keeps one merged dict as a cache: a hit or a miss is
+# a single lookup, whatever the number of layers. For the cache to stay right it has to hear about
+# writes, so the layers are Layer objects: dicts that report each changed key. Only those keys are
+# looked up again in the layers; the rest of the cache stays. A plain dict can't report its writes,
+# so FastChainMap refuses it with a TypeError rather than quietly serving stale values: wrap it once,
+# config = Layer(config), and use the Layer from then on. After editing the chain.maps list itself
+# (rather than using new_child or parents), call refresh().
+# Iteration order: a fresh cache has ChainMap's order (the last map's keys first), but a key that
+# first appears after that is added at the end, wherever its layer is. ChainMap would place it by
+# its deepest layer. Following that would mean rebuilding the cache on every new key. The keys and
+# values are the same either way, so compare the two with dict(a) == dict(b), not by key order.
+import weakref
+from collections import ChainMap
 
+class Layer(dict):
+    __slots__ = ('_chains', '__weakref__')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._chains = weakref.WeakValueDictionary()   # id -> every FastChainMap using this layer
+
+    def _changed(self, keys):
+        for chain in list(self._chains.values()):
+            chain._invalidate(keys)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed((key,))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed((key,))
+
+    def pop(self, key, *default):
+        had = key in self
+        value = super().pop(key, *default)
+        if had:
+            self._changed((key,))
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._changed((key,))
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        new = dict(*args, **kwargs)
+        super().update(new)
+        self._changed(new)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        keys = list(self)
+        super().clear()
+        self._changed(keys)
+
+    def copy(self):
+        return Layer(self)
+
+class FastChainMap(ChainMap):
+    def __init__(self, *maps):
+        self.maps = list(maps) or [Layer()]
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the cache from scratch, e.g. after changing the maps list directly."""
+        for m in self.maps:
+            if not isinstance(m, Layer):
+                raise TypeError(f'FastChainMap needs Layer maps, which report their changes, '
+                                f'not {type(m).__name__}: pass Layer(m) and keep using that')
+        for layer in self.maps:
+            layer._chains[id(self)] = self         # Weak: a dropped chain stops listening
+        self._merged = None
+
+    def _flat(self):
+        if self._merged is None:                   # Built lazily, in C: the first map wins
+            merged = {}
+            for layer in reversed(self.maps):
+                merged.update(layer)
+            self._merged = merged
+        return self._merged
+
+    def _invalidate(self, keys):
+        merged = self._merged
+        if merged is None:
+            return
+        for key in keys:                           # Look the key up again, in every layer
+            for layer in self.maps:
+                if key in layer:
+                    merged[key] = layer[key]
+                    break
+            else:
+                merged.pop(key, None)
+
+    def __getitem__(self, key):
+        try:
+            return (self._merged if self._merged is not None else self._flat())[key]
+        except KeyError:
+            return self.__missing__(key)
+
+    def get(self, key, default=None):
+        return (self._merged if self._merged is not None else self._flat()).get(key, default)
+
+    @classmethod
+    def fromkeys(cls, iterable, *args):
+        return cls(Layer.fromkeys(iterable, *args))
+
+    def new_child(self, m=None, **kwargs):
+        return super().new_child(Layer() if m is None else m, **kwargs)
+
+    def __ror__(self, other):
+        merged = Layer(other)
+        for layer in reversed(self.maps):
+            merged.update(layer)
+        return type(self)(merged)
+
+    def __contains__(self, key): return key in self._flat()
+    def __len__(self): return len(self._flat())
+    def __iter__(self): return iter(self._flat())
+    def __bool__(self): return bool(self._flat())
+
+d1, d2 = Layer({'a': 1, 'b': 2}), Layer({'b': 3, 'c': 4})
+chain = FastChainMap(d1, d2)                        # FastChainMap({'a': 1}) raises TypeError: use Layer
+print(chain['b'], chain['c'], len(chain))           # 2 4 3. The first map wins, as with ChainMap
+chain['c'] = 5                                      # Writes go to the first layer, as with ChainMap
+chain.maps[1]['d'] = 6                              # A write to a deeper layer updates the cache too
+print(chain['c'], chain['d'], dict(chain))          # 5 6 {'b': 2, 'c': 5, 'a': 1, 'd': 6}
+print(list(ChainMap(*chain.maps)))                  # ['b', 'c', 'd', 'a']. Same keys, ChainMap's order
+child = chain.new_child(Layer({'a': 0}))
+print(child['a'], child.parents['a'], chain['a'])   # 0 1 1
+del chain.maps[0]['b']
+print(child['b'], chain['b'])                       # 3 3. Both chains share the layer, both heard of it
+d1['a'] = 100
+print(chain['a'], child['a'])                       # 100 0. d1 is the layer itself
+
+# Benchmark: lookups in 1 to 30 layers of 50 keys each. "deep" finds the key in the last layer,
+# "miss" doesn't find it at all; both make ChainMap check every layer.
+from timeit import timeit
+for n in 1, 10, 30:
+    layers = [{f'layer{i}_key{j}': j for j in range(50)} for i in range(n)]
+    deep = f'layer{n - 1}_key7'
+    line = []
+    for kind in ChainMap, FastChainMap:
+        c = kind(*layers) if kind is ChainMap else kind(*map(Layer, layers))
+        hit = timeit(lambda: c[deep], number=100_000) * 1e4
+        miss = timeit(lambda: c.get('nope'), number=100_000) * 1e4
+        line.append(f'{kind.__name__} deep {hit:5.0f} ns, miss {miss:5.0f} ns')
+    print(f'{n:>2} layers: ' + ' | '.join(line))
+
+
+# A dict that stays sorted
+# for key in sorted(dict2) sorts every key again on each pass: O(n log n), even after a one-key change.
+# SortedDict is a dict (lookups are plain dict lookups) that also keeps its keys sorted as they're
+# added and removed. The keys live in short sorted lists of up to 2 * load keys, with the largest
+# key of each in _maxes, so bisect finds the right list and insort() only moves that list's items:
+# an update costs O(log n + load) instead of a re-sort. Iteration, keys(), values() and items() go in
+# key order; irange() walks the keys between two bounds; peekitem() and popitem() work at either end.
+# Keys must all be comparable with each other, as for sorted().
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import ItemsView, KeysView, ValuesView
+from itertools import chain, islice, takewhile
+
+class SortedDict(dict):
+    load = 500
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._lists, self._maxes = [], []
+        self.update(*args, **kwargs)
+
+    def _add(self, key):                           # key is new
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([key])
+            maxes.append(key)
+            return
+        k = min(bisect_left(maxes, key), len(maxes) - 1)
+        insort(lists[k], key)
+        maxes[k] = lists[k][-1]
+        if len(lists[k]) > 2 * self.load:          # Split a list that got too long
+            half = lists[k][self.load:]
+            del lists[k][self.load:]
+            lists.insert(k + 1, half)
+            maxes[k:k + 1] = [lists[k][-1], half[-1]]
+
+    def _discard(self, key):                       # key is present
+        lists, maxes = self._lists, self._maxes
+        k = bisect_left(maxes, key)
+        block = lists[k]
+        del block[bisect_left(block, key)]
+        if block:
+            maxes[k] = block[-1]
+        else:
+            del lists[k], maxes[k]
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._discard(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._discard(key)
+        return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        new = dict(*args, **kwargs)
+        if len(new) > len(self):                   # Many new keys: one sort beats many insorts
+            super().update(new)
+            keys = sorted(super().keys())
+            self._lists = [keys[i:i + self.load] for i in range(0, len(keys), self.load)]
+            self._maxes = [block[-1] for block in self._lists]
+        else:
+            for key, value in new.items():
+                self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._lists, self._maxes = [], []
+
+    def copy(self):
+        return SortedDict(self)
+
+    def __reduce__(self):                          # copy, deepcopy and pickle rebuild from the items
+        return type(self), (dict(self),)
+
+    def __iter__(self):
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self):
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def keys(self): return KeysView(self)
+    def values(self): return ValuesView(self)
+    def items(self): return ItemsView(self)
+
+    def peekitem(self, last=True):
+        if not self:
+            raise KeyError('SortedDict is empty')
+        key = self._lists[-1][-1] if last else self._lists[0][0]
+        return key, self[key]
+
+    def popitem(self, last=True):
+        """Remove and return the item with the largest key (or the smallest, if last is False)."""
+        key, value = self.peekitem(last)
+        del self[key]
+        return key, value
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True), reverse=False):
+        """Keys from minimum to maximum (None: no bound), in order."""
+        lists, maxes = self._lists, self._maxes
+        if minimum is None:
+            k, i = 0, 0
+        else:                                      # First key >= minimum (or > minimum)
+            find = bisect_left if inclusive[0] else bisect_right
+            k = find(maxes, minimum)
+            i = find(lists[k], minimum) if k < len(lists) else 0
+        keys = chain(islice(lists[k], i, None) if k < len(lists) else (), chain.from_iterable(islice(lists, k + 1, None)))
+        if maximum is not None:
+            end = (lambda key: key <= maximum) if inclusive[1] else (lambda key: key < maximum)
+            keys = takewhile(end, keys)
+        return reversed(list(keys)) if reverse else keys
+
+    def __repr__(self):
+        return f'SortedDict({dict(self.items())!r})'
+
+dict2 = SortedDict({'c': 3, 'a': 1, 'b': 2})
+for key in dict2:                  # No sorted() needed
+    print(key, dict2[key])         # a 1, b 2, c 3
+dict2['aa'] = 11
+del dict2['b']
+print(list(dict2.items()))         # [('a', 1), ('aa', 11), ('c', 3)]
+print(list(dict2.irange('a', 'b', inclusive=(False, True))))  # ['aa']
+print(dict2.peekitem(last=False), dict2.popitem())  # ('a', 1) ('c', 3)
+print(dict2, isinstance(dict2, dict))              # SortedDict({'a': 1, 'aa': 11}) True
+import copy
+twin = copy.copy(dict2)            # Also works with deepcopy and pickle
+twin['b'] = 2
+print(list(dict2), list(twin))     # ['a', 'aa'] ['a', 'aa', 'b']
+
+# Benchmark: 100_000 keys; each round changes 10 keys, then walks all keys in order or looks at the
+# keys in a range. A plain dict has to sort again every round.
+import random
+from timeit import timeit
+n, rounds = 100_000, 20
+plain = {random.random(): i for i in range(n)}
+ordered = SortedDict(plain)
+updates = [[random.random() for _ in range(10)] for _ in range(rounds)]
+def plain_walk():
+    for new in updates:
+        plain.update(dict.fromkeys(new, 0))
+        for key in sorted(plain):
+            pass
+def sorted_walk():
+    for new in updates:
+        ordered.update(dict.fromkeys(new, 0))
+        for key in ordered:
+            pass
+def plain_range():
+    for new in updates:
+        plain.update(dict.fromkeys(new, 0))
+        keys = sorted(plain)
+        keys[bisect_left(keys, 0.5):bisect_right(keys, 0.501)]
+def sorted_range():
+    for new in updates:
+        ordered.update(dict.fromkeys(new, 0))
+        list(ordered.irange(0.5, 0.501))
+for func in plain_walk, sorted_walk, plain_range, sorted_range:
+    print(f'{func.__name__:>12}: {timeit(func, number=1) / rounds * 1e3:6.2f} ms per round')
+
+
+# Many dicts with the same keys - a column table
+# A list of {'red': 0, 'green': 0, 'blue': 255} dicts stores the three keys again in every dict,
+# plus a hash table sized for growth: ~180 bytes before the values. Instances of a class share one
+# key table between their __dict__s (PEP 412), and __slots__ drops the dict entirely; a value is still
+# a full Python object each time (an int above 256 costs 28 bytes on its own).
+# Table stores the column names once and each column in one container: an array with a typecode
+# (1 byte per 'B' value, 8 per 'd') or a plain list for anything else. table[i] is a small Row view
+# that reads and writes through to the columns and behaves like a read/write dict. Making that view
+# costs more than a dict lookup, so for bulk work read whole columns with column().
+import sys
+from array import array
+from collections.abc import MutableMapping
+from itertools import chain, repeat
+from operator import itemgetter
+
+class Row(MutableMapping):
+    __slots__ = ('_columns', '_i')
+
+    def __init__(self, columns, i):
+        self._columns, self._i = columns, i
+
+    def __getitem__(self, key): return self._columns[key][self._i]
+    def __setitem__(self, key, value):
+        if key not in self._columns:
+            raise KeyError(f'{key!r} is not a column')
+        self._columns[key][self._i] = value
+    def __delitem__(self, key): raise TypeError('a row always has every column')
+    def __iter__(self): return iter(self._columns)
+    def __len__(self): return len(self._columns)
+    def __repr__(self): return f'Row({dict(self)!r})'
+
+class Table:
+    def __init__(self, columns, types=None, records=()):
+        """columns: the names. types: {name: array typecode} for the columns to store packed."""
+        types = types or {}
+        self._columns = {name: array(types[name]) if name in types else [] for name in columns}
+        self._positions = range(0)                 # Grows with the table; checks and wraps indexes
+        self.extend(records)
+
+    @classmethod
+    def from_records(cls, records, types=None):
+        """The columns are every key found in the records, and every record must have them all."""
+        records = records if isinstance(records, list) else list(records)
+        return cls(dict.fromkeys(chain.from_iterable(records)), types, records)
+
+    def append(self, record):
+        self.extend((record,))
+
+    def extend(self, records):
+        records = records if isinstance(records, list) else list(records)
+        if any(map(len(self._columns).__lt__, map(len, records))):  # A key that isn't a column
+            extra = next(key for record in records for key in record if key not in self._columns)
+            raise KeyError(f'{extra!r} is not a column')
+        new = {}                                   # Build every column's values before changing any,
+        for name, column in self._columns.items():  # so a missing key or a bad value changes nothing
+            values = map(itemgetter(name), records)  # One C-level pass per column
+            new[name] = array(column.typecode, values) if isinstance(column, array) else list(values)
+        for name, column in self._columns.items():
+            column.extend(new[name])
+        self._positions = range(len(self._positions) + len(records))
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, i):
+        return Row(self._columns, self._positions[i])  # range raises the IndexError
+
+    def __iter__(self):
+        return map(Row, repeat(self._columns), self._positions)
+
+    def column(self, name):
+        return self._columns[name]                 # The array or list itself, no copy
+
+    def to_records(self):
+        names = list(self._columns)
+        return [dict(zip(names, values)) for values in zip(*self._columns.values())]
+
+    def nbytes(self):
+        """Bytes held by the columns (not counting objects in list columns)."""
+        return sum(sys.getsizeof(column) for column in self._columns.values())
+
+colors = Table.from_records([{'red': 0, 'green': 0, 'blue': 255}, {'red': 255, 'green': 0, 'blue': 0}],
+                            types={'red': 'B', 'green': 'B', 'blue': 'B'})
+colors.append({'red': 0, 'green': 128, 'blue': 0})
+print(colors[2], colors[2]['green'], len(colors))  # Row({'red': 0, 'green': 128, 'blue': 0}) 128 3
+colors[0]['green'] = 64                            # Writes go to the column
+print(colors.column('green'), dict(colors[0]))     # array('B', [64, 0, 128]) {'red': 0, 'green': 64, 'blue': 255}
+students = Table(['name', 'grade'], records=[{'name': 'Yu', 'grade': 'A'}, {'name': 'Mi', 'grade': 'B'}])
+print(students.to_records())       # [{'name': 'Yu', 'grade': 'A'}, {'name': 'Mi', 'grade': 'B'}]
+print([row['name'] for row in students if row['grade'] == 'A'])  # ['Yu']
+try:
+    students.append({'name': 'Jo', 'grade': 'C', 'age': 9})
+except KeyError as e:
+    print(e, len(students))        # "'age' is not a column" 2. Nothing was added
+
+# Benchmark: n colors, measured with tracemalloc while each layout is built from the same
+# value tuples. The values are 0 to 255, which Python caches, so this is the cost of the layout
+# itself; bigger ints add 28 bytes per value to every layout except a typed array. The bytes per
+# record hardly change with n, so it's kept small enough for the notes to run quickly.
+from timeit import timeit
+import random, tracemalloc
+class Pixel:                       # Instances share their __dict__ keys
+    def __init__(self, red, green, blue): self.red, self.green, self.blue = red, green, blue
+class SlotPixel:
+    __slots__ = ('red', 'green', 'blue')
+    def __init__(self, red, green, blue): self.red, self.green, self.blue = red, green, blue
+n = 20_000
+values = [(random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(n)]
+layouts = {
+    'list of dicts': lambda: [{'red': r, 'green': g, 'blue': b} for r, g, b in values],
+    'instances': lambda: [Pixel(*v) for v in values],
+    '__slots__': lambda: [SlotPixel(*v) for v in values],
+    'Table, lists': lambda: Table(['red', 'green', 'blue'], records=[{'red': r, 'green': g, 'blue': b} for r, g, b in values]),
+    "Table, 'B'": lambda: Table(['red', 'green', 'blue'], dict.fromkeys(['red', 'green', 'blue'], 'B'),
+                                [{'red': r, 'green': g, 'blue': b} for r, g, b in values]),
+}
+for label, build in layouts.items():
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    if isinstance(data, Table) or isinstance(data[0], dict):
+        read = timeit(lambda: data[500]['green'], number=100_000) * 1e4
+    else:
+        read = timeit(lambda: data[500].green, number=100_000) * 1e4
+    print(f'{label:>13}: {size / n:5.1f} bytes per record, {read:4.0f} ns per read')
+records = layouts['list of dicts']()
+print(f"Table.nbytes(): {data.nbytes() / n:.1f} bytes per record")
+print(f"Table column read: {timeit(lambda: data.column('green')[500], number=100_000) * 1e4:.0f} ns, "
+      f"column sum: {timeit(lambda: sum(data.column('green')), number=5) / 5 * 1e3:.1f} ms vs "
+      f"{timeit(lambda: sum(r['green'] for r in records), number=5) / 5 * 1e3:.1f} ms for the dicts")
 
 
 # Sources: Wikibooks
@@ -215,4 +215,998 @@ list1=[1, 2]; brokenClear(list1); print(list1)
 # Using clear() method is more clear. Prefer deleting slices when the slice isn't the whole list!
 
 
+# Copy-on-write containers - an alternative to deepcopy
+# deepcopy duplicates every nested object up front, even the ones that will never change.
+# A copy-on-write (COW) container shares its storage with its copies instead. Copying is O(1):
+# both sides just give up ownership of the storage. Whichever side writes first duplicates
+# that one level (a C-speed shallow copy), and nested containers are copied lazily, only when
+# they are reached through that level. Untouched branches stay shared: "structural sharing".
+# Once a container has handed out a child (x = students[0]), that handle may still be written to,
+# so from then on copy() also copies that one level and gives the copy O(1) copies of its children.
+from collections.abc import MutableMapping, MutableSequence
+from copy import deepcopy
+
+class _Cow:
+    __slots__ = ('_data', '_token', '_owner', '_lent')
+    # _token is None while _data is shared with a copy. Children remember the token of the
+    # parent that owns them in _owner, so a stale token means "shared, copy before handing out".
+    # _lent is True once a child has been handed out: someone may hold it and write through it.
+
+    def copy(self):                        # O(1), whatever the size, until a child is handed out
+        clone = object.__new__(type(self))
+        clone._owner, clone._lent = None, False
+        if self._lent and self._token is not None:
+            # The clone must not share the child objects a handle may point at. It gets its own
+            # copy of this level, holding copies of those children (each O(1), sharing their data).
+            clone._data, clone._token = self._data.copy(), object()
+            keys = self._data.keys() if isinstance(self._data, dict) else range(len(self._data))
+            for key in keys:
+                value = self._data[key]
+                if isinstance(value, _Cow) and value._owner is self._token:
+                    clone._data[key] = value.copy()
+                    clone._data[key]._owner = clone._token
+            return clone
+        self._token = None
+        clone._data, clone._token = self._data, None
+        return clone
+
+    __copy__ = copy
+
+    def _own(self):                        # Called before any write
+        if self._token is None:
+            self._data = self._data.copy()
+            self._token = object()
+
+    def _wrap(self, value):
+        value = cow(value)
+        if isinstance(value, _Cow):
+            value._owner = self._token
+        return value
+
+    def _child(self, key):                 # Mutable children are un-shared on the way down
+        value = self._data[key]
+        if isinstance(value, _Cow) and (self._token is None or value._owner is not self._token):
+            self._own()
+            value = self._data[key]        # Same object, the level was only shallow-copied
+            if value._owner is not self._token:
+                value = value.copy()
+                value._owner = self._token
+                self._data[key] = value
+        if isinstance(value, _Cow):
+            self._lent = True
+        return value
+
+    def __eq__(self, other):
+        return plain(self) == plain(other)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({plain(self)!r})'
+
+class CowDict(_Cow, MutableMapping):
+    def __init__(self, *args, **kwargs):
+        self._data, self._token, self._owner, self._lent = {}, object(), None, False
+        for key, value in dict(*args, **kwargs).items():
+            self._data[key] = self._wrap(value)
+
+    def __getitem__(self, key): return self._child(key)
+    def __iter__(self): return iter(self._data)
+    def __len__(self): return len(self._data)
+    def __contains__(self, key): return key in self._data
+
+    def __setitem__(self, key, value):
+        self._own()
+        self._data[key] = self._wrap(value)
+
+    def __delitem__(self, key):
+        self._own()
+        del self._data[key]
+
+class CowList(_Cow, MutableSequence):
+    def __init__(self, iterable=()):
+        self._data, self._token, self._owner, self._lent = [], object(), None, False
+        self._data.extend(self._wrap(value) for value in iterable)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):       # A slice is a new list sharing the same children
+            return CowList(self._data[index])
+        return self._child(index)
+
+    def __len__(self): return len(self._data)
+
+    def __setitem__(self, index, value):
+        self._own()
+        if isinstance(index, slice):
+            value = [self._wrap(item) for item in value]
+        else:
+            value = self._wrap(value)
+        self._data[index] = value
+
+    def __delitem__(self, index):
+        self._own()
+        del self._data[index]
+
+    def insert(self, index, value):
+        self._own()
+        self._data.insert(index, self._wrap(value))
+
+def cow(value):
+    """Wrap dicts and lists (recursively) in COW containers. Other values are returned as is."""
+    if isinstance(value, _Cow):
+        return value.copy()                # Never share one wrapper between two parents
+    if type(value) is dict:
+        return CowDict(value)
+    if type(value) is list:
+        return CowList(value)
+    return value
+
+def plain(value):
+    """The opposite of cow(): rebuild ordinary dicts and lists."""
+    if isinstance(value, CowDict):
+        return {key: plain(item) for key, item in value._data.items()}
+    if isinstance(value, CowList):
+        return [plain(item) for item in value._data]
+    return value
+
+students = cow([{'name':'Yu'}, {'name':'Mi'}, {'name':'Lee'}])
+students5 = students.copy()        # O(1). Nothing is duplicated yet
+students5[2]['name'] = 'Leeeeee'   # Duplicates students5's outer list and only the third dict
+print(students[2])                 # CowDict({'name': 'Lee'}). The original is untouched
+print(students5[2])                # CowDict({'name': 'Leeeeee'})
+students[0]['name'] = 'Yuuu'       # Works in the other direction too
+print(students5[0])                # CowDict({'name': 'Yu'})
+held = students[1]                 # A child handed out before the copy...
+students6 = students.copy()
+held['name'] = 'Mii'               # ...writes to students only
+print(students[1], students6[1])   # CowDict({'name': 'Mii'}) CowDict({'name': 'Mi'})
+print(plain(students5))            # Back to ordinary lists and dicts
+
+original = cow({'onelist':[1,2,3]})   # The DICT.py example
+copy2 = original.copy()
+copy2['onelist'].append(5)
+print(original, copy2)             # CowDict({'onelist': [1, 2, 3]}) CowDict({'onelist': [1, 2, 3, 5]})
+
+# Benchmark: copy a students-style list of dicts, then change one student.
+# Increase n to see the gap grow; deepcopy is O(n) per copy, the COW copy is O(1)
+# plus one shallow copy of the outer list on the first write.
+from timeit import timeit
+n = 10_000
+records = [{'name':f'student{i}', 'grades':[i % 10, 7, 9]} for i in range(n)]
+big = cow(records)
+
+def with_deepcopy():
+    c = deepcopy(records)
+    c[n // 2]['grades'][0] = 10
+
+def with_cow():
+    c = big.copy()
+    c[n // 2]['grades'][0] = 10
+
+print(f"deepcopy: {timeit(with_deepcopy, number=5) / 5 * 1e3:.2f} ms per copy and edit")
+print(f"cow:      {timeit(with_cow, number=5) / 5 * 1e3:.2f} ms per copy and edit")
+
+
+# A faster deepcopy for JSON-shaped data
+# copy.deepcopy handles any object: it keeps a memo dict (so shared references and cycles survive)
+# and looks up __deepcopy__ / __reduce_ex__ for every value. For trees made only of dicts, lists,
+# strings and numbers none of that is needed. The version below walks the tree with an explicit
+# stack, so deep nesting can't hit the recursion limit, and shares immutable leaves instead of
+# "copying" them. Anything else is handed to copy.deepcopy.
+# Trade-off: no memo, so two references to the same list become two separate lists, and a cycle
+# would never finish. That's fine for anything that came out of json.load().
+from copy import deepcopy
+
+_ATOMIC = frozenset({str, int, float, bool, type(None), bytes})
+
+def _immutable(value):
+    t = type(value)
+    return t in _ATOMIC or (t is tuple and all(_immutable(item) for item in value))
+
+def json_deepcopy(obj):
+    t = type(obj)
+    if t is not dict and t is not list:
+        return obj if _immutable(obj) else deepcopy(obj)
+    root = {} if t is dict else []
+    stack = [(obj, root)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        src, dst = pop()
+        if type(src) is dict:
+            for key, value in src.items():
+                t = type(value)
+                if t in _ATOMIC:
+                    dst[key] = value
+                elif t is dict or t is list:
+                    new = dst[key] = {} if t is dict else []
+                    push((value, new))
+                else:
+                    dst[key] = value if _immutable(value) else deepcopy(value)
+        else:
+            add = dst.append
+            for value in src:
+                t = type(value)
+                if t in _ATOMIC:
+                    add(value)
+                elif t is dict or t is list:
+                    new = {} if t is dict else []
+                    add(new)
+                    push((value, new))
+                else:
+                    add(value if _immutable(value) else deepcopy(value))
+    return root
+
+students = [{'name':'Yu'}, {'name':'Mi'}, {'name':'Lee'}]
+students5 = json_deepcopy(students)
+students5[2]['name'] = 'Leeeeee'
+print(students[2], students5[2])       # {'name': 'Lee'} {'name': 'Leeeeee'}
+
+original = {'onelist':[1,2,3]}
+copy2 = json_deepcopy(original)
+copy2['onelist'].append(5)
+print(original, copy2)                 # {'onelist': [1, 2, 3]} {'onelist': [1, 2, 3, 5]}
+
+nested = []
+for _ in range(100_000):               # Far deeper than the recursion limit
+    nested = [nested]
+json_deepcopy(nested)                  # Works. deepcopy(nested) raises RecursionError
+
+# Benchmark on the students and onelist examples, scaled up.
+# Each student is about 6 nodes, so n = 20_000 is ~120_000 of them. The notes use 20_000 to keep the
+# run short; set n = 200_000 for over a million nodes (both functions are O(n), the ratio holds).
+from timeit import timeit
+n = 20_000
+big_students = [{'name':f'student{i}', 'age':i % 90, 'grades':[i % 10, 7, 9]} for i in range(n)]
+big_original = {f'onelist{i}':[1, 2, 3, 'x', 4.5] for i in range(n)}
+for label, data in ('students', big_students), ('onelist', big_original):
+    assert json_deepcopy(data) == data
+    slow = timeit(lambda: deepcopy(data), number=3)
+    fast = timeit(lambda: json_deepcopy(data), number=3)
+    print(f'{label}: deepcopy {slow / 3 * 1e3:.1f} ms, json_deepcopy {fast / 3 * 1e3:.1f} ms, {slow / fast:.1f}x')
+
+
+# A compact 2D grid - an alternative to [[0]*4 for i in range(5)]
+# A list of lists costs one 8-byte pointer per cell, a list object per row and, for anything
+# other than small cached ints, a boxed object per value. An array.array stores the raw values
+# in one contiguous buffer instead. memoryview gives zero-copy views into it: a row is a plain
+# slice, and a column is a strided slice (every cols-th item).
+from array import array
+
+class Grid:
+    def __init__(self, rows, cols, typecode='i', fill=0):
+        self.rows, self.cols = rows, cols
+        self.data = array(typecode, [fill]) * (rows * cols)   # Typed cells, one allocation
+        self._view = memoryview(self.data)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):                 # grid[r, c]
+            r, c = key
+            return self.data[self._index(r, c)]
+        if isinstance(key, slice):                 # grid[a:b] -> 2D view of those rows
+            a, b, step = key.indices(self.rows)
+            if step != 1:
+                raise ValueError('grid slices take a run of rows: the step must be 1')
+            flat = self._view[a * self.cols:max(a, b) * self.cols]
+            if not flat:                           # No cells: a 2D view can't have a 0 in its shape
+                return flat
+            return flat.cast('B').cast(self.data.typecode, (b - a, self.cols))
+        return self.row(key)                       # grid[r] -> row view, so grid[r][c] works too
+
+    def __setitem__(self, key, value):
+        r, c = key
+        self.data[self._index(r, c)] = value
+
+    def _index(self, r, c):
+        if not (-self.rows <= r < self.rows and -self.cols <= c < self.cols):
+            raise IndexError('grid index out of range')
+        return (r % self.rows) * self.cols + c % self.cols
+
+    def row(self, r):
+        if not -self.rows <= r < self.rows:
+            raise IndexError('grid index out of range')
+        start = r % self.rows * self.cols
+        return self._view[start:start + self.cols]
+
+    def col(self, c):
+        return self._view[self._index(0, c)::self.cols]
+
+    def fill(self, value, rows=slice(None)):       # Bulk fill, whole grid or a range of rows
+        a, b, step = rows.indices(self.rows)
+        if step != 1:
+            raise ValueError('fill takes a run of rows: the step must be 1')
+        n = max(b - a, 0) * self.cols
+        self._view[a * self.cols:a * self.cols + n] = array(self.data.typecode, [value]) * n
+
+    def __buffer__(self, flags):                   # Buffer protocol, Python 3.12+
+        return self[:]
+
+    def tolist(self):
+        return self[:].tolist() if self.cols else [[] for _ in range(self.rows)]
+
+    def __repr__(self):
+        return f'Grid({self.rows}, {self.cols}, {self.data.typecode!r})'
+
+grid = Grid(5, 4)                  # Same shape as [[0]*4 for i in range(5)]
+grid[0, 2] = 1
+grid[1][3] = 7                     # Row views are writable and share the buffer
+print(grid.tolist())               # [[0, 0, 1, 0], [0, 0, 0, 7], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+print(grid.col(3).tolist())        # [0, 7, 0, 0, 0]. A column, without copying
+grid.col(0)[1:3] = array('i', [5, 5])  # Column views are writable too
+grid.fill(9, rows=slice(3, 5))     # Bulk fill the last two rows
+print(grid[2:5].tolist())          # [[5, 0, 0, 0], [9, 9, 9, 9], [9, 9, 9, 9]]
+print(grid[2:5][0, 0])             # 5. 2D views index with [r, c]
+print(Grid(2, 2, 'd', 0.5).tolist())   # [[0.5, 0.5], [0.5, 0.5]]. Any array typecode
+print(Grid(0, 4).tolist(), Grid(2, 0).tolist())  # [] [[], []]. Like [[0]*4 for i in range(0)]
+print(bytes(Grid(2, 3, 'B', 1)[:]))    # b'\x01\x01\x01\x01\x01\x01'. Views are buffers
+# bytes(Grid(2, 3, 'B', 1))            # Same, since 3.12. PEP 688 lets a class define __buffer__
+
+# Benchmark: memory and access time against a list of lists.
+# The notes use 1000 x 1000; the savings hold at 10**4 x 10**4 (800 MB of pointers vs 400 MB of 'i').
+import sys
+from timeit import timeit
+n = 1000
+lol = [[0]*n for i in range(n)]
+g = Grid(n, n, 'i')
+lol_bytes = sys.getsizeof(lol) + sum(sys.getsizeof(row) for row in lol)
+grid_bytes = sys.getsizeof(g.data)
+print(f'list of lists: {lol_bytes / 2**20:.1f} MiB, grid: {grid_bytes / 2**20:.1f} MiB')
+# Single cells pay for a method call; whole rows and columns are where the grid wins.
+print(f'lol[r][c]: {timeit(lambda: lol[500][500], number=100_000) * 1e4:.0f} ns per read')
+print(f'g[r, c]:   {timeit(lambda: g[500, 500], number=100_000) * 1e4:.0f} ns per read')
+print(f'column sum, lol:  {timeit(lambda: sum(row[7] for row in lol), number=20) / 20 * 1e3:.2f} ms')
+print(f'column sum, grid: {timeit(lambda: sum(g.col(7)), number=20) / 20 * 1e3:.2f} ms')
+
+
+# Sorting by several keys, each ascending or descending
+# key=lambda x: (x[1], -x[2]) only works when the descending field is a number, and it builds a
+# tuple for every row. Python's sort is stable (equal keys keep their order, reverse=True included),
+# so sorting once per key, from the last key to the first, gives the same result for any field type.
+# Each pass uses an itemgetter: the key is computed in C and no tuples are made.
+# For the first `top` rows only, a full sort is wasted work. heapq finds the top values of the first
+# key, and only the rows that can still make it (ties included) get the full multi-key sort.
+import heapq
+from itertools import compress, repeat
+from operator import ge, itemgetter, le
+
+def compile_sort(spec):
+    """Turn [(field, 'asc' | 'desc'), ...] into sort(rows, top=None), which returns a sorted list.
+    field is an index or dict key (for itemgetter), or a key function."""
+    keys = []
+    for field, order in spec:
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+        keys.append((field if callable(field) else itemgetter(field), order == 'desc'))
+
+    def sort(rows, top=None):
+        rows = list(rows)                          # Any iterable; the top path reads the rows twice
+        if top is not None and top < len(rows):
+            first, reverse = keys[0]
+            values = (heapq.nlargest if reverse else heapq.nsmallest)(top, map(first, rows))
+            if not values:
+                return []
+            # Rows whose first key is at least as good as the top-th best value. All in C.
+            rows = list(compress(rows, map(le if reverse else ge, repeat(values[-1]), map(first, rows))))
+        for key, reverse in reversed(keys):
+            rows.sort(key=key, reverse=reverse)
+        return rows if top is None else rows[:top]
+    return sort
+
+students = [('Bob', 'B', 12), ('Pete', 'B', 10), ('Tom', 'A', 15)]   # From the students example
+by_grade_then_age = compile_sort([(1, 'asc'), (2, 'desc')])
+print(by_grade_then_age(students))                 # Same as key=lambda x: (x[1], -x[2]) above
+by_grade_desc_then_name = compile_sort([(1, 'desc'), (0, 'asc')])
+print(by_grade_desc_then_name(students))           # [('Bob', 'B', 12), ('Pete', 'B', 10), ('Tom', 'A', 15)]. -x[1] is a TypeError for str
+print(compile_sort([(2, 'desc')])(iter(students), top=1))  # [('Tom', 'A', 15)]. The oldest, without a full sort
+people = [{'name': 'Mi', 'city': 'Oslo'}, {'name': 'Yu', 'city': 'Lima'}, {'name': 'Lee', 'city': 'Oslo'}]
+print(compile_sort([('city', 'desc'), ('name', 'asc')])(people))  # Dict keys work too: Lee, Mi (Oslo), Yu (Lima)
+print(compile_sort([(len, 'desc'), (str.lower, 'asc')])(['b', 'A', 'ccc', 'dd']))  # ['ccc', 'dd', 'A', 'b']
+
+# Benchmark: the notes sort 20_000 rows; add zeros to n for the 10**7 case (about 2 GB of tuples).
+import random
+from functools import cmp_to_key
+from timeit import timeit
+n = 20_000
+rows = [(f'name{random.randrange(n)}', random.choice('ABCDF'), random.randrange(10, 20), random.random()) for i in range(n)]
+grade_age = compile_sort([(1, 'asc'), (2, 'desc')])
+def compare(a, b):                 # The general way to mix directions on strings with sorted()
+    return (a[1] > b[1]) - (a[1] < b[1]) or (b[0] > a[0]) - (b[0] < a[0])
+grade_name = compile_sort([(1, 'asc'), (0, 'desc')])
+tests = [
+    ('grade asc, age desc: tuple key', lambda: sorted(rows, key=lambda x: (x[1], -x[2]))),
+    ('grade asc, age desc: compile_sort', lambda: grade_age(rows)),
+    ('grade asc, name desc: cmp_to_key', lambda: sorted(rows, key=cmp_to_key(compare))),
+    ('grade asc, name desc: compile_sort', lambda: grade_name(rows)),
+    ('top 10: sorted()[:10]', lambda: sorted(rows, key=lambda x: (x[1], -x[2]))[:10]),
+    ('top 10: compile_sort', lambda: grade_age(rows, top=10)),
+]
+for label, func in tests:
+    print(f'{label:<36} {timeit(func, number=3) / 3 * 1e3:7.1f} ms')
+print(grade_age(rows, top=10) == grade_age(rows)[:10])  # True
+
+
+# Lazy pipelines - an alternative to nested comprehensions for big streams
+# A list comprehension builds the whole list before the next step can start. For a stream that
+# doesn't fit in memory, each step has to hand items on one at a time. Chaining generators does that,
+# but every generator in the chain is resumed once per item. Pipeline records the steps, and when it's
+# iterated it turns each run of map/filter/flat_map/product steps into ONE generated generator (the
+# way namedtuple and dataclasses generate code), so an item pays for one resume plus the calls to your
+# functions. take() and chunk() are itertools wrappers. pmap() sends batches to worker processes
+# for CPU-heavy functions; results come back in order and memory stays bounded by the batch size.
+# Pipelines are immutable: every step returns a new one, so a half-built pipeline can be reused.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+_FUSABLE = {'map', 'filter', 'flat_map', 'product', 'product_with'}
+
+@lru_cache
+def _fuse(kinds):
+    """A generated generator function running the given steps, e.g. ('map', 'filter') gives
+    for x0 in source: x1 = s0(x0); if s1(x1): yield x1"""
+    lines, pad, cur = ['    for x0 in source:'], '        ', 'x0'
+    for i, kind in enumerate(kinds):
+        new = f'x{i + 1}'
+        if kind == 'map':
+            lines.append(f'{pad}{new} = s{i}({cur})')
+        elif kind == 'filter':
+            lines.append(f'{pad}if s{i}({cur}):')
+            new, pad = cur, pad + '    '
+        elif kind == 'flat_map':
+            lines.append(f'{pad}for {new} in s{i}({cur}):')
+            pad += '    '
+        else:                                      # s{i} is (values, func): every pair of x and a value
+            lines.append(f'{pad}for y{i} in s{i}[0]:')
+            pad += '    '
+            pair = f's{i}[1]({cur}, y{i})' if kind == 'product_with' else f'({cur}, y{i})'
+            lines.append(f'{pad}{new} = {pair}')
+        cur = new
+    lines.append(f'{pad}yield {cur}')
+    args = ''.join(f', s{i}' for i in range(len(kinds)))
+    namespace = {}
+    exec(f'def fused(source{args}):\n' + '\n'.join(lines), namespace)
+    return namespace['fused']
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def _pmap(iterable, func, workers, chunksize):
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        for batch in _batches(iterable, chunksize * workers * 4):   # A few chunks per worker at a time
+            yield from pool.map(func, batch, chunksize=chunksize)
+
+class Pipeline:
+    __slots__ = ('_source', '_steps')
+
+    def __init__(self, source, steps=()):
+        self._source, self._steps = source, steps
+
+    def _then(self, kind, *args):
+        return Pipeline(self._source, self._steps + ((kind, args),))
+
+    def map(self, func): return self._then('map', func)
+    def filter(self, predicate): return self._then('filter', predicate)
+    def flat_map(self, func): return self._then('flat_map', func)       # func returns an iterable
+    def product(self, iterable, func=None):                           # (x, y), or func(x, y)
+        return self._then('product_with' if func else 'product', iterable, func)
+    def take(self, n): return self._then('take', n)
+    def chunk(self, size): return self._then('chunk', size)          # Lists of `size` items
+    def pmap(self, func, workers=None, chunksize=256):                 # func must be picklable
+        return self._then('pmap', func, workers, chunksize)
+
+    def __iter__(self):
+        stream, run = self._source, []
+        for kind, args in self._steps + (('end', ()),):
+            if kind in _FUSABLE:
+                run.append((kind, args))
+                continue
+            if run:                                # Fuse the run of steps that ends here
+                fused = _fuse(tuple(k for k, _ in run))
+                stream = fused(stream, *[(tuple(a[0]), a[1]) if k.startswith('product') else a[0] for k, a in run])
+                run = []
+            if kind == 'take':
+                stream = islice(stream, args[0])
+            elif kind == 'chunk':
+                stream = _batches(stream, args[0])
+            elif kind == 'pmap':
+                stream = _pmap(stream, *args)
+        return iter(stream)
+
+    def list(self):
+        return list(self)
+
+print(Pipeline(range(10)).filter(lambda x: x % 2 == 1).map(lambda x: x + 1).list())  # [2, 4, 6, 8, 10]
+print(Pipeline('123').product('abc', str.__add__).list())  # ['1a', '1b', '1c', '2a', ..., '3c']
+print(Pipeline([1, 2, 3]).flat_map(lambda n: [n] * 3).list())  # [1, 1, 1, 2, 2, 2, 3, 3, 3]
+print(Pipeline(range(3)).product(range(3)).take(4).list())  # [(0, 0), (0, 1), (0, 2), (1, 0)]
+print(Pipeline(range(10)).chunk(4).list())         # [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+import itertools
+evens = Pipeline(itertools.count()).filter(lambda x: x % 2 == 0)   # An endless stream, nothing runs yet
+print(evens.map(lambda x: x * x).take(5).list())   # [0, 4, 16, 36, 64]
+import math
+print(Pipeline(range(2000, 2008)).pmap(math.factorial).map(int.bit_length).list())  # Factorials in worker processes
+
+# Benchmark: 5 steps over n items: map, filter, map, filter, map.
+# A list per step, chained generators, chained map()/filter(), and a Pipeline. n is kept small so the
+# notes run quickly; set it to 10**6 and the lists' peak memory grows with it while the others stay flat.
+from timeit import timeit
+import tracemalloc
+inc, odd, dbl, small, neg = (lambda x: x + 1), (lambda x: x & 1), (lambda x: x * 2), (lambda x: x < n), (lambda x: -x)
+n = 20_000
+src = range(n)
+def lists():
+    a = [inc(x) for x in src]; b = [x for x in a if odd(x)]; c = [dbl(x) for x in b]
+    return sum([neg(x) for x in [x for x in c if small(x)]])
+def generators():
+    a = (inc(x) for x in src); b = (x for x in a if odd(x)); c = (dbl(x) for x in b)
+    return sum(neg(x) for x in (x for x in c if small(x)))
+def builtins():
+    return sum(map(neg, filter(small, map(dbl, filter(odd, map(inc, src))))))
+def pipeline():
+    return sum(Pipeline(src).map(inc).filter(odd).map(dbl).filter(small).map(neg))
+for func in lists, generators, builtins, pipeline:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{func.__name__:>10}: {timeit(func, number=3) / 3 * 1e3:6.1f} ms, peak {peak / 2**20:5.1f} MiB')
+
+
+# An indexed list - O(1) in and count(), and index() between changes
+# 'cat' in list1, list1.count('cat') and list1.index('cat') compare against every item until they
+# find it (count() always goes to the end). IndexedList is a real list that also keeps a Counter of its
+# values and a dict of the first position of each value. in and count() become dict lookups, and a
+# value that isn't there fails index() or remove() at once, without a scan.
+# Appending, extending and popping from the end keep both up to date. Anything that shifts positions
+# (insert, remove, pop(i), del, slice assignment, reverse, sort) updates the counts and marks the
+# positions stale; the next index() rebuilds them in one C-speed O(n) pass, and the ones after it are
+# O(1) until the next such change. remove() is still O(n), as list.remove() is: it has to shift the
+# items after the one it removes, and once the positions are stale it finds it with list.index().
+# Items must be hashable, and an item mutated in place (a list inside the list) breaks the index.
+from collections import Counter
+
+class IndexedList(list):
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._counts = Counter(self)
+        self._first = None                         # value -> first position, or None when stale
+
+    def _add(self, values):
+        self._counts.update(values)
+
+    def _discard(self, values):
+        counts = self._counts
+        for value in values:
+            counts[value] -= 1
+            if not counts[value]:
+                del counts[value]
+
+    def _positions(self):
+        if self._first is None:                    # Walked backwards, so the first position wins
+            self._first = dict(zip(reversed(self), range(len(self) - 1, -1, -1)))
+        return self._first
+
+    def __contains__(self, value):
+        try:
+            return value in self._counts
+        except TypeError:                          # Unhashable: can't be in here, but ask the list
+            return super().__contains__(value)
+
+    def count(self, value):
+        try:
+            return self._counts[value]
+        except TypeError:
+            return super().count(value)
+
+    def index(self, value, start=0, stop=None):
+        if value not in self:
+            raise ValueError(f'{value!r} is not in list')
+        position = self._positions()[value]
+        if start == 0 and stop is None:
+            return position
+        start = max(start + len(self), 0) if start < 0 else start
+        stop = len(self) if stop is None else stop
+        if position >= start and position < stop:
+            return position
+        return super().index(value, start, stop)
+
+    def append(self, value):
+        self._counts[value] += 1
+        if self._first is not None:
+            self._first.setdefault(value, len(self))
+        super().append(value)
+
+    def extend(self, iterable):
+        n = len(self)
+        super().extend(iterable)
+        self._add(self[n:])
+        if self._first is not None:
+            for i, value in enumerate(self[n:], n):
+                self._first.setdefault(value, i)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n):
+        if n > 0:
+            self.extend(self[:] * (n - 1))
+        else:
+            self.clear()
+        return self
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._counts[value] += 1
+        self._first = None
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self._discard((value,))
+        if index in (-1, len(self)) and self._first is not None:
+            if value not in self._counts:          # It was the last one: its first position goes too
+                del self._first[value]
+        else:
+            self._first = None
+        return value
+
+    def remove(self, value):
+        if value not in self:
+            raise ValueError(f'{value!r} is not in list')
+        self.pop(self._positions()[value] if self._first is not None else super().index(value))
+
+    def __setitem__(self, index, value):
+        old = self[index]
+        if isinstance(index, slice):
+            value = list(value)                    # It may be an iterator, and we need it twice
+            super().__setitem__(index, value)
+            self._discard(old)
+            self._add(value)
+        else:
+            super().__setitem__(index, value)
+            self._discard((old,))
+            self._counts[value] += 1
+        self._first = None
+
+    def __delitem__(self, index):
+        old = self[index]
+        super().__delitem__(index)
+        self._discard(old if isinstance(index, slice) else (old,))
+        self._first = None
+
+    def clear(self):
+        super().clear()
+        self._counts.clear()
+        self._first = {}
+
+    def reverse(self):
+        super().reverse()
+        self._first = None
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self._first = None
+
+    def copy(self):
+        return IndexedList(self)
+
+    def __reduce__(self):                          # copy, deepcopy and pickle rebuild from the items
+        return type(self), (list(self),)
+
+list1 = IndexedList(['cat', 'dog', 'cat', 'bird'])
+print('cat' in list1, list1.count('cat'), list1.index('bird'))  # True 2 3. No scans
+list1.remove('cat')
+list1.insert(0, 'fish')
+list1[1:3] = ['cat', 'cat', 'cat']
+print(list1, list1.count('cat'), list1.index('bird'))  # ['fish', 'cat', 'cat', 'cat', 'bird'] 3 4
+list1.sort()
+print(list1.pop(), list1.index('cat'), 'fish' in list1)  # fish 1 False
+list1 += ['ant']
+list1.reverse()
+print(list1, list1.index('ant'), isinstance(list1, list))  # ['ant', 'cat', 'cat', 'cat', 'bird'] 0 True
+list1.clear()
+print('cat' in list1, list1.count('cat'))           # False 0
+
+# Benchmark: 200 lookups in a list of 200_000 strings, half of them hits spread over the list and
+# half misses. A list scan grows with the list; the indexed lookups don't. The first index() after
+# creating the IndexedList pays for building the positions once.
+from timeit import timeit
+import sys
+n = 200_000
+words = [f'word{i}' for i in range(n)]
+indexed = IndexedList(words)
+hits, misses = words[::n // 100], [f'none{i}' for i in range(100)]
+for label, seq in ('list', words), ('IndexedList', indexed):
+    t_in = timeit(lambda: [w in seq for w in hits + misses], number=1)
+    t_count = timeit(lambda: [seq.count(w) for w in hits], number=1)
+    t_index = timeit(lambda: [seq.index(w) for w in hits], number=1)
+    print(f'{label:>11}: 200 x in {t_in * 1e3:7.1f} ms, 100 x count() {t_count * 1e3:7.1f} ms, 100 x index() {t_index * 1e3:7.1f} ms')
+extra = sys.getsizeof(indexed._counts) + sys.getsizeof(indexed._first)
+print(f'Index memory: {extra / 2**20:.0f} MiB on top of the list\'s {sys.getsizeof(words) / 2**20:.1f} MiB of pointers')
+
+
+# A blocked list - fast inserts and deletes anywhere
+# list1.insert(0, 'fly') and list1.pop(1) move every item after the position by one slot: O(n).
+# A deque is fast at both ends only; in the middle it's O(n) too, and so is indexing it.
+# BlockedList keeps the items in blocks of load to 2 * load items (load defaults to 1000), and the
+# block sizes in a Fenwick tree (binary indexed tree), so finding the block for a position and
+# updating a size are both O(log n). An insert or delete moves at most one block's worth of pointers:
+# O(load + log n) per edit instead of O(n). Blocks split when they reach 2 * load and merge with a
+# neighbour below load / 2; only then is the tree rebuilt. Iteration, count and `in` run in C.
+# del list6[a:b] trims the two blocks at its ends and drops every block between them in one step.
+from collections.abc import MutableSequence
+from itertools import chain, islice
+import operator
+
+class BlockedList(MutableSequence):
+    def __init__(self, iterable=(), load=1000):
+        self._load = load
+        self._blocks, self._tree, self._len = [], None, 0   # _tree is None when it needs a rebuild
+        self.extend(iterable)
+
+    def _build(self):
+        tree = [0, *map(len, self._blocks)]
+        for i in range(1, len(tree)):              # Fenwick tree: tree[i] sums a run of blocks ending at i
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+        return tree
+
+    def _resize(self, k, delta):                   # Block k grew or shrank by delta
+        self._len += delta
+        tree = self._tree
+        if tree is not None:
+            i = k + 1
+            while i < len(tree):
+                tree[i] += delta
+                i += i & -i
+
+    def _start(self, k):                           # Position of the first item of block k
+        tree, i, total = self._tree or self._build(), k, 0
+        while i:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError('BlockedList index out of range')
+        tree = self._tree or self._build()
+        k, step = 0, 1 << (len(tree) - 1).bit_length()
+        while step:                                # Walk down the tree: O(log(number of blocks))
+            if k + step < len(tree) and tree[k + step] <= i:
+                k += step
+                i -= tree[k]
+            step >>= 1
+        return k, i
+
+    def _balance(self, k):
+        blocks, load = self._blocks, self._load
+        block = blocks[k]
+        if len(block) >= 2 * load:
+            blocks[k:k + 1] = [block[i:i + load] for i in range(0, len(block), load)]
+            self._tree = None
+        elif len(block) < load // 2 and len(blocks) > 1:
+            if k + 1 == len(blocks):
+                k -= 1
+            blocks[k] += blocks.pop(k + 1)         # Merge with the next block
+            self._tree = None
+            if len(blocks[k]) >= 2 * load:
+                self._balance(k)
+        elif not block:
+            del blocks[k]
+            self._tree = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        return chain.from_iterable(map(reversed, reversed(self._blocks)))
+
+    def __contains__(self, value):
+        return any(value in block for block in self._blocks)
+
+    def count(self, value):
+        return sum(block.count(value) for block in self._blocks)
+
+    def index(self, value, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if start < stop:
+            k, j = self._locate(start)
+            offset = self._start(k)
+            for block in islice(self._blocks, k, None):
+                if offset >= stop:
+                    break
+                try:
+                    return offset + block.index(value, max(start - offset, 0), stop - offset)
+                except ValueError:
+                    offset += len(block)
+        raise ValueError(f'{value!r} is not in BlockedList')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1 or start >= stop:
+                return BlockedList(list(self)[index], self._load)
+            k, j = self._locate(start)
+            items = list(islice(chain(islice(self._blocks[k], j, None), chain.from_iterable(islice(self._blocks, k + 1, None))), stop - start))
+            return BlockedList(items, self._load)
+        k, j = self._locate(index)
+        return self._blocks[k][j]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                value = list(value)
+                del self[start:max(start, stop)]
+                self._insert_many(start, value)
+                return
+            positions = range(start, stop, step)
+            value = list(value)
+            if len(value) != len(positions):
+                raise ValueError(f'attempt to assign sequence of size {len(value)} to extended slice of size {len(positions)}')
+            for i, item in zip(positions, value):
+                self[i] = item
+            return
+        k, j = self._locate(index)
+        self._blocks[k][j] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                for i in sorted(range(start, stop, step), reverse=True):
+                    del self[i]
+                return
+            if start >= stop:
+                return
+            if stop - start == self._len:
+                return self.clear()
+            (k1, j1), (k2, j2) = self._locate(start), self._locate(stop - 1)
+            blocks = self._blocks
+            if k1 == k2:                           # All in one block
+                del blocks[k1][j1:j2 + 1]
+                self._resize(k1, start - stop)
+                self._balance(k1)
+                return
+            del blocks[k2][:j2 + 1]                # Trim the two edge blocks, drop the ones between
+            del blocks[k1][j1:]                    # in one step, then rebalance and rebuild once
+            del blocks[k1 + 1:k2]
+            self._len -= stop - start
+            self._tree = None
+            self._balance(k1 + 1)
+            self._balance(min(k1, len(blocks) - 1))
+            return
+        k, j = self._locate(index)
+        del self._blocks[k][j]
+        self._resize(k, -1)
+        self._balance(k)
+
+    def insert(self, index, value):
+        self._insert_many(index, (value,))
+
+    def _insert_many(self, index, values):
+        if index < 0:
+            index = max(index + self._len, 0)
+        if index >= self._len:
+            return self.extend(values)
+        k, j = self._locate(index)
+        self._blocks[k][j:j] = values
+        self._resize(k, len(values))
+        self._balance(k)
+
+    def append(self, value):
+        if self._blocks and len(self._blocks[-1]) < 2 * self._load - 1:
+            self._blocks[-1].append(value)
+            self._resize(len(self._blocks) - 1, 1)
+        else:
+            self.extend((value,))
+
+    def extend(self, iterable):
+        iterable = iter(list(iterable) if iterable is self else iterable)
+        load = self._load
+        if self._blocks:                           # Top up the last block first
+            last = self._blocks[-1]
+            n = len(last)
+            last.extend(islice(iterable, max(load - n, 0)))
+            self._resize(len(self._blocks) - 1, len(last) - n)
+        while block := list(islice(iterable, load)):
+            self._blocks.append(block)
+            self._len += len(block)
+            self._tree = None
+        if self._blocks:
+            self._balance(len(self._blocks) - 1)   # The last block may be small
+
+    def pop(self, index=-1):
+        if self._blocks and index == -1:           # Fast path: the end
+            value = self._blocks[-1].pop()
+            self._resize(len(self._blocks) - 1, -1)
+            if not self._blocks[-1]:
+                self._blocks.pop()
+                self._tree = None
+            return value
+        k, j = self._locate(index)
+        value = self._blocks[k].pop(j)
+        self._resize(k, -1)
+        self._balance(k)
+        return value
+
+    def clear(self):
+        self._blocks, self._tree, self._len = [], None, 0
+
+    def reverse(self):
+        self._blocks.reverse()
+        for block in self._blocks:
+            block.reverse()
+        self._tree = None
+
+    def sort(self, *, key=None, reverse=False):
+        items = list(self)
+        items.sort(key=key, reverse=reverse)
+        self.clear()
+        self.extend(items)
+
+    def copy(self):
+        return BlockedList(self, self._load)
+
+    __copy__ = copy
+
+    def __repr__(self):
+        return f'BlockedList({list(self)!r})'
+
+    def _compare(self, other, op):
+        if not isinstance(other, (BlockedList, list)):
+            return NotImplemented
+        for a, b in zip(self, other):
+            if not (a is b or a == b):
+                return op is not operator.eq and (op is operator.ne or op(a, b))
+        return op(len(self), len(other))
+
+    def __eq__(self, other): return self._compare(other, operator.eq)
+    def __ne__(self, other): return self._compare(other, operator.ne)
+    def __lt__(self, other): return self._compare(other, operator.lt)
+    def __le__(self, other): return self._compare(other, operator.le)
+    def __gt__(self, other): return self._compare(other, operator.gt)
+    def __ge__(self, other): return self._compare(other, operator.ge)
+    __hash__ = None
+
+list1 = BlockedList(['cat', 'dog'], load=2)       # A tiny load, so the blocks show
+list1.insert(0, 'fly')
+list1[0:0] = ['ant', 'bee']
+print(list1, list1._blocks)        # BlockedList(['ant', 'bee', 'fly', 'cat', 'dog']) [['ant', 'bee'], ['fly', 'cat'], ['dog']]
+print(list1.pop(1), list1[1:3], list1[-1])  # bee BlockedList(['fly', 'cat']) dog
+list1.sort(reverse=True)
+print(list1, list1 == ['fly', 'dog', 'cat', 'ant'], list1 < ['fly', 'eel'])  # BlockedList(['fly', 'dog', 'cat', 'ant']) True True
+del list1[:]
+print(list1, len(list1))           # BlockedList([]) 0
+
+# Benchmark: 2000 inserts and 2000 deletes at random positions. deque pays O(n) for the middle too.
+# The notes stop at 10**6 items; the gap keeps growing at 10**7 and 10**8 (list edits move n / 2
+# pointers each, BlockedList edits about load + log n).
+import random
+from collections import deque
+from timeit import timeit
+def edits(seq, positions):
+    for i in positions:
+        seq.insert(i, i)
+    for i in positions:
+        del seq[i]
+for n in 10**4, 10**5, 10**6:
+    positions = [random.randrange(n) for _ in range(2000)]
+    line = []
+    for kind in list, deque, BlockedList:
+        seq = kind(range(n))
+        line.append(f'{kind.__name__} {timeit(lambda: edits(seq, positions), number=1) * 1e3:7.1f} ms')
+    print(f'{n:>8} items: ' + ', '.join(line))
+
+
 # Sources include: Wikibooks, Docs, Other.
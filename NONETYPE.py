@@ -16,3 +16,145 @@ print (type(val))
 
 # None can be used when a variable needs to be initialized to a default value representing
 # the absence of any meaningful data, if desired.
+
+
+# A column of numbers that may be None
+# In a list, every slot is an 8-byte pointer, and every number it points to is an object of its own
+# (24 bytes for a float, 28 for most ints); None costs only the pointer, as there's just one None.
+# OptionalColumn keeps the numbers in a typed array (8 bytes per 'd', 4 per 'i' or 'f') and whether
+# each slot holds a value in a bitmap, 1 bit per slot. A missing slot holds 0 in the array, so sum()
+# can add up the whole array in C; min() and max() pick the values out with compress(). Iterating or
+# indexing gives None for a missing slot. The number of Nones is kept up to date, so counting is O(1).
+# The saving is biggest for dense data; for data that's nearly all None, a {position: value} dict
+# may be smaller still. Walking the column is slower than walking a list: each value is made into
+# a Python object as it's read.
+from array import array
+from collections.abc import Sequence
+from itertools import chain, compress, repeat
+from operator import getitem
+
+_BITS = [tuple(bool(byte >> i & 1) for i in range(8)) for byte in range(256)]  # byte -> 8 flags
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+class OptionalColumn(Sequence):
+    def __init__(self, typecode, items=()):
+        self._values = array(typecode)
+        self._valid = bytearray()                  # Bit i of byte i // 8: slot i holds a value
+        self._nulls = 0
+        self.extend(items)
+
+    def __len__(self):
+        return len(self._values)
+
+    def _flags(self):                              # One bool per slot, in C
+        return chain.from_iterable(map(_BITS.__getitem__, self._valid))
+
+    def append(self, value):
+        n = len(self._values)
+        self._values.append(0 if value is None else value)   # A bad value raises before the bitmap changes
+        if n % 8 == 0:
+            self._valid.append(0)
+        if value is None:
+            self._nulls += 1
+        else:
+            self._valid[n >> 3] |= 1 << (n & 7)
+
+    def extend(self, items):
+        items = list(items)
+        values = array(self._values.typecode, [0 if item is None else item for item in items])  # Raises first
+        flags = bytes(item is not None for item in items)
+        n = len(self._values)
+        self._values.extend(values)
+        head = -n % 8                              # Free bits in the last byte of the bitmap
+        for i in range(min(head, len(flags))):
+            self._valid[(n + i) >> 3] |= flags[i] << ((n + i) & 7)
+        if rest := flags[head:]:                   # Pack the rest 8 to a byte: '0101...' read as binary
+            bits = int(rest[::-1].translate(_TO_DIGITS), 2)
+            self._valid += bits.to_bytes((len(rest) + 7) // 8, 'little')
+        self._nulls += len(items) - sum(flags)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return OptionalColumn(self._values.typecode, [self[i] for i in range(*index.indices(len(self)))])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('OptionalColumn index out of range')
+        value = self._values[index]
+        return value if self._valid[index >> 3] >> (index & 7) & 1 else None
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):             # Before anything changes
+            raise IndexError('OptionalColumn index out of range')
+        was = self[index] is None
+        self._values[index] = 0 if value is None else value
+        mask = 1 << (index & 7)
+        if value is None:
+            self._valid[index >> 3] &= ~mask & 0xFF
+        else:
+            self._valid[index >> 3] |= mask
+        self._nulls += (value is None) - was
+
+    def __iter__(self):                            # (None, value)[flag] for each slot, in C
+        return map(getitem, zip(repeat(None), self._values), self._flags())
+
+    def null_count(self):
+        return self._nulls
+
+    def count(self, value):
+        return self._nulls if value is None else super().count(value)
+
+    def values(self):
+        """The values that aren't None, in order."""
+        return compress(self._values, self._flags())
+
+    def sum(self):
+        return sum(self._values)                   # Missing slots hold 0
+
+    def min(self, default=None):
+        return min(self.values(), default=default)
+
+    def max(self, default=None):
+        return max(self.values(), default=default)
+
+    def nbytes(self):
+        return self._values.itemsize * len(self._values) + len(self._valid)
+
+    def __repr__(self):
+        return f'OptionalColumn({self._values.typecode!r}, {list(self)!r})'
+
+readings = OptionalColumn('d', [20.5, None, 19.0, None])
+readings.append(None)
+readings.extend([22.0, None, None, 18.5])
+print(readings[1], readings[2], len(readings))     # None 19.0 9
+print(readings.sum(), readings.min(), readings.max(), readings.null_count())  # 80.0 18.5 22.0 5
+readings[1] = 21.0
+print(list(readings[:4]), readings.count(None))    # [20.5, 21.0, 19.0, None] 4
+print(OptionalColumn('i', [None, None]).max())     # None. Nothing to compare, like SQL's MAX
+
+# Benchmark: 10**5 floats, 90% and then 10% of them None, in a list and in OptionalColumn('d'),
+# with the memory measured by tracemalloc and the list aggregates skipping None with filter().
+import random, tracemalloc
+from functools import partial
+from operator import is_not
+from timeit import timeit
+n = 10**5
+for share in 0.9, 0.1:
+    data = [None if random.random() < share else random.random() for _ in range(n)]
+    for label, build in ('list', lambda: [x if x is None else x + 0.0 for x in data]), \
+                        ('OptionalColumn', lambda: OptionalColumn('d', data)):
+        tracemalloc.start()
+        column = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if isinstance(column, list):
+            present = partial(is_not, None)
+            stats = {'sum': lambda: sum(filter(present, column)), 'max': lambda: max(filter(present, column)),
+                     'nulls': lambda: column.count(None)}
+        else:
+            stats = {'sum': column.sum, 'max': column.max, 'nulls': column.null_count}
+        times = ', '.join(f'{name} {timeit(f, number=3) / 3 * 1e3:6.2f} ms' for name, f in stats.items())
+        walk = timeit(lambda: sum(1 for x in column if x is None), number=1) * 1e3
+        print(f'{share:.0%} None, {label:>14}: {size / n:5.2f} bytes per slot, {times}, walk {walk:4.0f} ms')
@@ -118,6 +118,165 @@ for item in lv:
     print(item)
 lv = []
 
+# TO INT, IN BULK
+print('\tTO INT, IN BULK\n')
+
+_ = '''Calling int() once per field from a Python loop costs a bytecode round trip per value. For a column of \
+millions of strings, parse it in blocks instead. A block made only of digits, minus signs and whitespace is \
+joined and handed to json.loads, whose C scanner reads plain decimal ints much faster. Anything else goes to \
+array('q', map(int, ...)): map and the array constructor loop in C, and int() itself does the parsing, so the \
+grammar is exactly the one above (whitespace, signs, underscores, bases, base 0 prefixes) and so are the \
+ValueErrors. int() also accepts bytes, so a delimited bytes buffer is split and parsed without decoding it. A \
+block with a bad value is re-parsed one value at a time so every failure is reported with its row number.\n'''
+print(_)
+
+import json
+from array import array
+from itertools import islice, repeat
+
+_DECIMAL = b'0123456789-, \t\n\r'          # Bytes that can only form plain decimal ints in JSON
+
+def _parse_block(block, base, typecode):
+    if base == 10:                            # Fast path: json's C scanner reads plain decimal ints
+        try:
+            text = (',' if isinstance(block[0], str) else b',').join(block)
+        except TypeError:
+            text = None                       # Mixed types. int() decides below
+        if isinstance(text, str):
+            text = text.encode() if text.isascii() else None  # Non-ASCII digits: int() too
+        if text is not None and not text.translate(None, _DECIMAL):
+            try:
+                values = json.loads(b'[' + text + b']')
+                if len(values) == len(block):
+                    return array(typecode, values)
+            except ValueError:
+                pass                          # e.g. leading zeros, which int() does accept
+    return array(typecode, map(int, block, repeat(base)))
+
+def parse_ints(column, base=10, sep=b'\n', typecode='q', numpy=False):
+    """Parse a column of str/bytes values, or one delimited bytes buffer, into array(typecode).
+    Returns (values, failures). failures lists (row, message) pairs; failed rows hold 0."""
+    if isinstance(column, (bytes, bytearray, memoryview)):
+        column = bytes(column).split(sep)
+        if column and not column[-1].strip():
+            column.pop()                      # Trailing separator, not an empty last value
+    values, failures = array(typecode), []
+    it, row = iter(column), 0
+    while block := list(islice(it, 1 << 16)):
+        try:
+            values.extend(_parse_block(block, base, typecode))
+        except (ValueError, TypeError, OverflowError):
+            for i, field in enumerate(block, row):    # Slow path, only for this block
+                try:
+                    values.append(int(field, base))
+                except (ValueError, TypeError, OverflowError) as e:
+                    values.append(0)
+                    failures.append((i, str(e)))
+        row += len(block)
+    if numpy:
+        import numpy as np                    # Optional. Zero-copy view of the same buffer
+        values = np.frombuffer(values, dtype=values.typecode)
+    return values, failures
+
+lv.append(f'{parse_ints(["1234", " +1_2_3_4 ", "  -1234"]) = }') # All three parse, as with int()
+lv.append(f'{parse_ints(["1011", "0b1011"], base=2) = }') # 11 and 11
+lv.append(f'{parse_ints(["0b1010", "0o12", "0x1A", "-0x010"], base=0) = }') # 10, 10, 26, -16
+buffer = b'12\n-7\n0x1A\n'                # One big delimited bytes buffer, e.g. read from a file
+lv.append(f'{parse_ints(buffer, base=0) = }') # 12, -7, 26
+lv.append(f'{parse_ints(b"1,2,3", sep=b",") = }') # Any separator
+lv.append(f'{parse_ints(["7", "010", "- 1234", "1__2", "x"], base=0)[1] = }') # Per-row ValueErrors, same as int()
+lv.append(f'{parse_ints(["1", str(2**63)])[1] = }') # Too big for 'q'. Use typecode='Q' or a smaller one to save space
+
+from timeit import timeit
+column = [str(i) for i in range(200_000)]
+lv.append(f'\nint() in a loop: {timeit(lambda: array("q", [int(s) for s in column]), number=5) / 5 * 1e3:.1f} ms')
+lv.append(f'parse_ints:      {timeit(lambda: parse_ints(column), number=5) / 5 * 1e3:.1f} ms\n')
+
+for item in lv:
+    print(item)
+lv = []
+
+# TO INT, FROM FIXED-WIDTH BYTE RECORDS
+print('\tTO INT, FROM FIXED-WIDTH BYTE RECORDS\n')
+
+_ = '''int.from_bytes() decodes one value from one bytes object. For a binary feed of millions of fixed-width \
+records, slicing out a bytes object per field and calling int.from_bytes() on it is the slow part. A field can \
+be decoded as a whole column instead: byte j of the field in every record is memoryview[offset + j::record_size], \
+a strided view that copies nothing. Assigning those byte columns into a bytearray with the same kind of step \
+lines the bytes up as native machine integers, which array.frombytes() reads in one go. Widths of 3, 5, 6 and 7 \
+bytes, which the struct module can't do, are padded to 4 or 8 bytes; for signed fields the padding is filled \
+with 0xFF wherever the sign bit is set (one bytes.translate() call), which is exactly sign extension.\n'''
+print(_)
+
+import sys
+from array import array
+
+_SIGN_FILL = bytes(0xFF if b & 0x80 else 0 for b in range(256))
+_TYPECODES = {(array(t).itemsize, t.islower()): t for t in 'LlQqIiHhBb'}  # Later wins: b, h, i, q
+
+class RecordLayout:
+    """fields: (name, width, byteorder, signed) tuples, in record order, widths 1 to 8 bytes."""
+
+    def __init__(self, fields, size=None):
+        self.fields, offset = [], 0
+        for name, width, byteorder, signed in fields:
+            if not 1 <= width <= 8:
+                raise ValueError(f'{name}: width must be between 1 and 8 bytes')
+            if byteorder not in ('little', 'big'):
+                raise ValueError(f"{name}: byteorder must be 'little' or 'big', not {byteorder!r}")
+            padded = next(w for w in (1, 2, 4, 8) if w >= width)
+            self.fields.append((name, offset, width, padded, byteorder, signed))
+            offset += width
+        if size is not None and size < offset:
+            raise ValueError(f'size {size} is smaller than the {offset} bytes the fields take')
+        self.size = size or offset                 # size > offset leaves trailing padding alone
+
+    def decode(self, buffer, names=None):
+        """Decode every record in buffer (bytes, bytearray, memoryview, mmap). Returns {name: array}."""
+        view = memoryview(buffer).cast('B')
+        n = len(view) // self.size
+        columns = {}
+        for name, offset, width, padded, byteorder, signed in self.fields:
+            if names is not None and name not in names:
+                continue
+            out = bytearray(n * padded)
+            for j in range(width):                 # One strided copy per byte of the field
+                significance = j if byteorder == 'little' else width - 1 - j
+                pos = significance if sys.byteorder == 'little' else padded - 1 - significance
+                out[pos::padded] = view[offset + j:offset + j + n * self.size:self.size]
+            if signed and padded > width:          # Sign-extend 3, 5, 6 and 7 byte fields
+                top = offset + (width - 1 if byteorder == 'little' else 0)
+                fill = bytes(view[top:top + n * self.size:self.size]).translate(_SIGN_FILL)
+                for significance in range(width, padded):
+                    pos = significance if sys.byteorder == 'little' else padded - 1 - significance
+                    out[pos::padded] = fill
+            column = array(_TYPECODES[padded, signed])
+            column.frombytes(out)
+            columns[name] = column
+        return columns
+
+# A record: 2-byte big-endian unsigned id, 3-byte little-endian signed delta, 1 signed byte
+layout = RecordLayout([('id', 2, 'big', False), ('delta', 3, 'little', True), ('flag', 1, 'big', True)])
+records = b''.join(i.to_bytes(2, 'big') + (-i * 1000).to_bytes(3, 'little', signed=True)
+                   + (i - 2).to_bytes(1, 'big', signed=True) for i in range(5))
+lv.append(f'{layout.decode(records) = }') # Three array-backed columns
+lv.append(f'{layout.decode(records)["delta"][4] == int.from_bytes(records[26:29], "little", signed=True) = }') # True
+lv.append(f'     {RecordLayout([("x", 2, "big", True)]).decode(b"\xAA\xFF")["x"] = }') # array('h', [-21761]), as above
+lv.append('Raw: RecordLayout([("x", 2, "big", True)]).decode(b"\\xAA\\xFF")["x"] = array(\'h\', [-21761])')
+
+# Works the same on an mmap, e.g. mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), without reading the file.
+from timeit import timeit
+big = records * 40_000
+n = len(big) // layout.size
+loop = lambda: [int.from_bytes(big[i * 6 + 2:i * 6 + 5], 'little', signed=True) for i in range(n)]
+assert list(layout.decode(big, names={'delta'})['delta']) == loop()
+lv.append(f'\nint.from_bytes loop: {timeit(loop, number=3) / 3 * 1e3:.1f} ms for {n} values')
+lv.append(f'RecordLayout.decode: {timeit(lambda: layout.decode(big, names={"delta"}), number=3) / 3 * 1e3:.1f} ms\n')
+
+for item in lv:
+    print(item)
+lv = []
+
 # TO FLOAT
 print('\tTO FLOAT\n')
 
@@ -156,17 +315,359 @@ for item in lv:
     print(item)
 lv.clear()
 
+# TO FLOAT, IN BULK
+print('\tTO FLOAT, IN BULK\n')
+
+_ = '''To parse a large file of numbers, read it in fixed-size chunks instead of all at once, split each chunk \
+into tokens and convert the whole chunk with array('d', map(float, tokens)). The loop runs in C and float() \
+does the parsing, so exactly the strings above are accepted: infinity in any case, -inf, nan, -.23, leading \
+whitespace, exponents with e or E. float() accepts bytes too, so binary files and mmaps need no decoding. A \
+token cut in half at the end of a chunk is carried over to the next one, so memory use depends on the chunk \
+size, not the input size. A chunk with a bad token is re-parsed token by token; bad tokens become nan and are \
+reported with their position.\n'''
+print(_)
+
+import io
+from array import array
+
+def _blocks(source, chunk_size):
+    if hasattr(source, 'read'):                  # Text or binary file, stdin, socket.makefile()...
+        while block := source.read(chunk_size):
+            yield block
+    else:                                        # str, bytes, bytearray, memoryview, mmap
+        view = source if isinstance(source, (str, bytes)) else memoryview(source).cast('B')
+        for i in range(0, len(view), chunk_size):
+            block = view[i:i + chunk_size]
+            yield block if isinstance(block, (str, bytes)) else bytes(block)
+
+def _with_end(blocks):
+    yield from blocks
+    yield None
+
+def _like(text, chunk):
+    return text if isinstance(chunk, str) else text.encode()
+
+def iter_floats(source, chunk_size=1 << 20, sep=None):
+    """Yield (array('d'), errors) per chunk. Tokens are split on whitespace, or on sep and newlines.
+    errors lists (token_index, token, message); the value at a bad token's index is nan."""
+    tail, index = None, 0
+    for block in _with_end(_blocks(source, chunk_size)):
+        if block is None:                        # End of input: what is left is a whole token
+            if not tail:
+                break
+            chunk, tail = tail, None
+        else:
+            chunk = block if tail is None else tail + block
+            tail = None
+            if sep is None:                      # Text after the last separator may be cut in half
+                if not chunk[-1:].isspace():
+                    *head, tail = chunk.rsplit(None, 1)
+                    chunk = head[0] if head else chunk[:0]
+            else:
+                chunk = chunk.replace(_like('\n', chunk), _like(sep, chunk))
+                cut = chunk.rfind(_like(sep, chunk))
+                chunk, tail = (chunk[:cut], chunk[cut + len(sep):]) if cut >= 0 else (chunk[:0], chunk)
+        if sep is None:
+            tokens = chunk.split()
+        else:                                    # Empty fields (blank lines, trailing commas) are skipped
+            tokens = [t for t in chunk.split(_like(sep, chunk)) if t.strip()]
+        if not tokens:
+            continue
+        errors = []
+        try:
+            values = array('d', map(float, tokens))
+        except ValueError:
+            values = array('d')
+            for i, token in enumerate(tokens, index):
+                try:
+                    values.append(float(token))
+                except ValueError as e:
+                    values.append(float('nan'))
+                    errors.append((i, token, str(e)))
+        index += len(tokens)
+        yield values, errors
+
+def parse_floats(source, chunk_size=1 << 20, sep=None):
+    """Like iter_floats, but collects everything into one array('d') and one list of errors."""
+    values, errors = array('d'), []
+    for chunk_values, chunk_errors in iter_floats(source, chunk_size, sep):
+        values.extend(chunk_values)
+        errors.extend(chunk_errors)
+    return values, errors
+
+text = 'infinity inFINIty inf -inf nan -.23    -12345 1e-003 2.7E-2'
+lv.append(f'{parse_floats(text)[0] = }') # The strings from the section above, in one go
+lv.append(f'{str(parse_floats(io.StringIO(text), chunk_size=4)[0]) == str(parse_floats(text)[0]) = }') # True. Compared as str since nan != nan. Tokens cut at chunk edges survive
+lv.append(f'{parse_floats(io.BytesIO(b"1.5,-2e3,nan,4"), sep=",")[0] = }') # Binary file, comma separated
+lv.append(f'{parse_floats("1.5 abc 3j 2")[1] = }') # [(1, 'abc', ...), (2, '3j', ...)]. Per-token errors
+lv.append(f'{[len(v) for v, _ in iter_floats(io.StringIO("1 2 3 4 5 6"), chunk_size=4)] = }') # [2, 2, 1, 1]. One array per chunk
+
+# float() itself is most of the cost; dropping the per-token bytecode helps some. The bigger
+# difference is memory: the loop holds every token at once, parse_floats one chunk at a time.
+import tempfile, tracemalloc
+from timeit import timeit
+with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+    f.write(' '.join(repr(i / 7) for i in range(200_000)))
+def loop():
+    with open(f.name, 'rb') as file:
+        return array('d', [float(t) for t in file.read().split()])
+def bulk():
+    with open(f.name, 'rb') as file:
+        return parse_floats(file, chunk_size=1 << 16)
+for label, func in ('float() in a loop', loop), ('parse_floats', bulk):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    lv.append(f'{label + ":":<18} {timeit(func, number=3) / 3 * 1e3:.1f} ms, peak {peak / 2**20:.1f} MiB')
+lv.append('')
+import os; os.remove(f.name)
+
+for item in lv:
+    print(item)
+lv = []
+
+# A CONVERSION REGISTRY
+print('\tA CONVERSION REGISTRY\n')
+
+_ = '''The sections below show the built-in constructors, plus a registry that picks a converter per \
+(source type, target type) pair: convert(value, target). Without a registration the target's own constructor \
+is used, so convert(x, float) is float(x). Registrations cover the cases where the constructor fails or does \
+something surprising, like str(b'abc') giving "b'abc'". A converter for a base class also covers its \
+subclasses (the source type's MRO is searched, like functools.singledispatch does for one type), and the \
+lookup for a pair is resolved once and cached, so repeated calls cost one dict lookup instead of a chain of \
+isinstance() checks. convert_many() resolves the converter once for a column of values of one type.\n'''
+print(_)
+
+_converters = {}                      # (source type, target type) -> function
+_resolved = {}                        # Cache of the MRO search. Cleared on every registration
+
+def register(source, target):
+    def decorator(func):
+        _converters[source, target] = func
+        _resolved.clear()
+        return func
+    return decorator
+
+def _resolve(source, target):
+    for cls in source.__mro__:
+        if (cls, target) in _converters:
+            return _converters[cls, target]
+    return target                     # Fall back to the constructor
+
+def convert(value, target):
+    try:
+        func = _resolved[type(value), target]
+    except KeyError:
+        func = _resolved[type(value), target] = _resolve(type(value), target)
+    return func(value)
+
+def convert_many(values, target):
+    """Convert every item. When they all have the same type the converter is looked up once."""
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    types = set(map(type, values))
+    if len(types) != 1:
+        return [convert(value, target) for value in values]
+    source, = types
+    try:
+        func = _resolved[source, target]
+    except KeyError:
+        func = _resolved[source, target] = _resolve(source, target)
+    return list(map(func, values))
+
 # TO COMPLEX
+print('\tTO COMPLEX\n')
+
+_ = '''Casting to complex is done using complex(real, imag) or complex(string). A string may have whitespace \
+around it, but not around the + or - in the middle.\n'''
+print(_)
+
+lv.append('From various literals')
+lv.append(f'{complex() = }') # 0j
+lv.append(f'{complex(3) = }') # (3+0j)
+lv.append(f'{complex(1.5, -2) = }') # (1.5-2j). Real and imaginary parts
+lv.append(f'{complex(True) = }') # (1+0j)
+
+lv.append('\nFrom various strings')
+lv.append(f'{complex("1+2j") = }') # (1+2j)
+lv.append(f'{complex("  -1.5e3-2J ") = }') # (-1500-2j). Both j and J can be used
+lv.append(f'{complex("j") = }') # 1j
+lv.append(f'{complex("inf-nanj") = }') # (inf+nanj). Same special values as float
+
+@register(tuple, complex)
+def _(value): return complex(*value)
+@register(bytes, complex)
+def _(value): return complex(value.decode('ascii'))
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert((1, 2), complex) = }') # (1+2j). complex((1, 2)) is a TypeError
+lv.append(f'{convert(b"3-4j", complex) = }') # (3-4j). complex(b"3-4j") is a TypeError
+lv.append(f'{convert(7, complex) = }') # (7+0j). No registration: complex(7)
+
+lv.append('\nThe following will NOT work')
+lv.append('complex("1 + 2j")') # ValueError. No whitespace around the sign in the middle
+lv.append('complex("1", 2)') # TypeError. A string must be the only argument
+
+for item in lv:
+    print(item)
+lv = []
 
 # TO LIST OR TUPLE
+print('\tTO LIST OR TUPLE\n')
+
+_ = '''list() and tuple() take any iterable and collect its items. A string gives its characters, a dict its \
+keys and bytes their integer values.\n'''
+print(_)
+
+lv.append(f'{list("abc") = }') # ['a', 'b', 'c']
+lv.append(f'{tuple([1, 2]) = }') # (1, 2)
+lv.append(f'{list({"y": 34, "x": 56}) = }') # ['y', 'x']. Keys only
+lv.append(f'{list({"y": 34}.items()) = }') # [('y', 34)]. Use items() for pairs
+lv.append(f'{list(b"ab") = }') # [97, 98]
+lv.append(f'{tuple(range(3)) = }') # (0, 1, 2)
+lv.append(f'{sorted({3, 1, 2}) = }') # [1, 2, 3]. Sets are unordered; sorted() returns a list
+
+@register(type(None), list)
+def _(value): return []
+@register(type(None), tuple)
+def _(value): return ()
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert(None, list) = }') # []. list(None) is a TypeError
+lv.append(f'{convert_many(["ab", "cd"], tuple) = }') # [('a', 'b'), ('c', 'd')]. Resolved once for str
+
+lv.append('\nThe following will NOT work')
+lv.append('list(5)') # TypeError. 'int' object is not iterable
+
+for item in lv:
+    print(item)
+lv = []
 
 # TO SET OR FROZENSET
+print('\tTO SET OR FROZENSET\n')
+
+_ = '''set() and frozenset() take any iterable too. Duplicates are dropped and every item must be hashable.\n'''
+print(_)
+
+lv.append(f'{set("hello") == {"h", "e", "l", "o"} = }') # True. One 'l'
+lv.append(f'{frozenset([1, 1, 2]) = }') # frozenset({1, 2})
+lv.append(f'{set({"y": 34, "x": 56}) == {"y", "x"} = }') # True. Keys only, like list()
+lv.append(f'{set(b"aab") = }') # {97, 98}
+
+@register(type(None), set)
+def _(value): return set()
+@register(type(None), frozenset)
+def _(value): return frozenset()
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert(None, frozenset) = }') # frozenset()
+
+lv.append('\nThe following will NOT work')
+lv.append('set([[1, 2]])') # TypeError. unhashable type: 'list'
+lv.append('set(5)') # TypeError. 'int' object is not iterable
+
+for item in lv:
+    print(item)
+lv = []
 
 # TO STR
+print('\tTO STR\n')
+
+_ = '''str() works on any object: it calls __str__, falling back to __repr__. That is why it never fails, and \
+also why str(b'abc') gives the representation "b'abc'" instead of the text. Use decode for that.\n'''
+print(_)
+
+lv.append(f'{str(1234) = }') # '1234'
+lv.append(f'{str(-0.5) = }') # '-0.5'
+lv.append(f'{str(None) = }') # 'None'
+lv.append(f'{str([1, "a"]) = }') # "[1, 'a']"
+lv.append(f'{str(b"abc") = }') # "b'abc'". Probably not what you wanted
+lv.append(f'{str(b"abc", "utf-8") = }') # 'abc'. With an encoding, bytes are decoded
+lv.append(f'{format(255, "x") = }') # 'ff'. format() and f-strings for a specific layout
+
+@register(bytes, str)
+def _(value): return value.decode('utf-8')
+@register(bytearray, str)
+def _(value): return value.decode('utf-8')
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert(b"abc", str) = }') # 'abc'
+lv.append(f'{convert(True, str) = }') # 'True'. bool has no registration, so str(True)
+
+for item in lv:
+    print(item)
+lv = []
 
 # TO BYTEARRAY OR BYTES
+print('\tTO BYTEARRAY OR BYTES\n')
+
+_ = '''bytes() and bytearray() take a str with an encoding, an iterable of ints in range(256), an object with \
+the buffer protocol, or an int. Careful: the int is a size, not a value. See bytes at a glance for more.\n'''
+print(_)
+
+lv.append(f'{bytes("abc", "utf-8") = }') # b'abc'
+lv.append(f'{bytearray([97, 98]) = }') # bytearray(b'ab')
+lv.append(f'{bytes(bytearray(b"ab")) = }') # b'ab'. From another buffer
+lv.append(f'{bytes(3) = }') # 3 zero bytes, not the number 3
+lv.append(f'{(3).to_bytes(2, "big") = }') # The number 3, in 2 bytes
+
+@register(str, bytes)
+def _(value): return value.encode('utf-8')
+@register(str, bytearray)
+def _(value): return bytearray(value, 'utf-8')
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert("Γειά", bytes) = }') # UTF-8 by default. bytes("Γειά") is a TypeError
+
+lv.append('\nThe following will NOT work')
+lv.append('bytes("abc")') # TypeError. string argument without an encoding
+lv.append('bytes([300])') # ValueError. bytes must be in range(0, 256)
+
+for item in lv:
+    print(item)
+lv = []
 
 # TO DICT
+print('\tTO DICT\n')
+
+_ = '''dict() takes a mapping, an iterable of key/value pairs, keyword arguments, or a mix. See dictionaries \
+at a glance for more.\n'''
+print(_)
+
+lv.append(f'{dict([("y", 34), ("x", 56)]) = }') # {'y': 34, 'x': 56}
+lv.append(f'{dict(zip("ab", [1, 2])) = }') # {'a': 1, 'b': 2}
+lv.append(f'{dict(y=34) = }') # {'y': 34}
+lv.append(f'{dict({"y": 34}, x=56) = }') # {'y': 34, 'x': 56}
+lv.append(f'{dict(["ab", "cd"]) = }') # {'a': 'b', 'c': 'd'}. Any 2-item iterable is a pair
+
+@register(type(None), dict)
+def _(value): return {}
+
+lv.append('\nUsing the registry')
+lv.append(f'{convert(None, dict) = }') # {}
+
+lv.append('\nThe following will NOT work')
+lv.append('dict([1, 2])') # TypeError. cannot convert dictionary update sequence element #0 to a sequence
+lv.append('dict(["abc"])') # ValueError. dictionary update sequence element #0 has length 3; 2 is required
+
+from timeit import timeit
+def isinstance_chain(value):          # What the registry replaces, in a serialisation layer
+    if value is None: return ''
+    if isinstance(value, bool): return 'true' if value else 'false'
+    if isinstance(value, (int, float)): return repr(value)
+    if isinstance(value, str): return value
+    if isinstance(value, (list, tuple)): return ','.join(map(isinstance_chain, value))
+    if isinstance(value, dict): return repr(value)
+    if isinstance(value, (bytes, bytearray)): return value.decode('utf-8')
+    return str(value)
+column = [b'value%d' % i for i in range(100_000)]
+lv.append(f'\nisinstance chain: {timeit(lambda: [isinstance_chain(v) for v in column], number=5) / 5 * 1e3:.1f} ms')
+lv.append(f'convert:          {timeit(lambda: [convert(v, str) for v in column], number=5) / 5 * 1e3:.1f} ms')
+lv.append(f'convert_many:     {timeit(lambda: convert_many(column, str), number=5) / 5 * 1e3:.1f} ms\n')
+
+for item in lv:
+    print(item)
+lv = []
 
 
 # NEXT DOCUMENT:
@@ -0,0 +1,165 @@
+# Benchmarks the six ways of merging d1 and d2 shown in DICT.py:
+#   loop, update(), {**d1, **d2}, d1 | d2, dict(d1, **d2) and ChainMap(d2, d1)
+# over dict sizes from 10 to 10**7 keys and key overlap ratios from 0% to 100%.
+#
+# For every (method, size, overlap) it reports:
+#   merge_ns     Best time per merge, in nanoseconds
+#   peak_bytes   Peak memory allocated by one merge, from tracemalloc
+#   lookup_ns    Time per key lookup on the merged result. This is where ChainMap pays.
+#
+# Results are written as JSON so runs on different Python versions can be compared.
+#
+# Usage:
+#   python bench_dict_merge.py                            # Full sweep, prints a table
+#   python bench_dict_merge.py --max-size 100000 -o 3.12.json
+#   python bench_dict_merge.py --overlaps 0 0.5 1
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import ChainMap
+
+# ChainMap prefers the first mapping, so d2 goes first to match the other methods (d2 wins).
+# Method 5 only works with string keys, which is why every key below is a string.
+
+def merge_loop(d1, d2):
+    merged = d1.copy()
+    for key, value in d2.items():
+        merged[key] = value
+    return merged
+
+
+def merge_update(d1, d2):
+    merged = d1.copy()
+    merged.update(d2)
+    return merged
+
+
+def merge_unpack(d1, d2):
+    return {**d1, **d2}
+
+
+def merge_pipe(d1, d2):
+    return d1 | d2
+
+
+def merge_constructor(d1, d2):
+    return dict(d1, **d2)
+
+
+def merge_chainmap(d1, d2):
+    return ChainMap(d2, d1)
+
+
+METHODS = {
+    'loop': merge_loop,
+    'update': merge_update,
+    'unpack': merge_unpack,
+    'pipe': merge_pipe,
+    'constructor': merge_constructor,
+    'chainmap': merge_chainmap,
+}
+SIZES = [10 ** e for e in range(1, 8)]
+OVERLAPS = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def make_dicts(size, overlap):
+    """Two dicts of `size` string keys where `overlap` of d2's keys also exist in d1."""
+    shared = int(size * overlap)
+    d1 = {f'k{i}': i for i in range(size)}
+    d2 = {f'k{i}': -i for i in range(size - shared, 2 * size - shared)}
+    return d1, d2
+
+
+def best_time(func, *args, budget=0.05, repeat=3):
+    """Best seconds per call, looping enough times for each repeat to last about `budget`."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(budget / elapsed) + 1))
+    times = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) / number
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def lookup_all(mapping, keys):
+    for key in keys:
+        mapping[key]
+
+
+def bench(size, overlap, methods):
+    d1, d2 = make_dicts(size, overlap)
+    # d1-only keys are the worst case for ChainMap(d2, d1): they miss in d2 first.
+    keys = list(d1)[: min(size, 100_000)] + list(d2)[: min(size, 100_000)]
+    rows = []
+    for name in methods:
+        func = METHODS[name]
+        merged = func(d1, d2)
+        rows.append({
+            'method': name,
+            'size': size,
+            'overlap': overlap,
+            'merged_len': len(merged),
+            'merge_ns': best_time(func, d1, d2) * 1e9,
+            'peak_bytes': peak_memory(func, d1, d2),
+            'lookup_ns': best_time(lookup_all, merged, keys) / len(keys) * 1e9,
+        })
+        del merged
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the dict merging methods from DICT.py.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--max-size', type=int, default=None, help='skip sizes above this')
+    parser.add_argument('--overlaps', type=float, nargs='+', default=OVERLAPS)
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes if args.max_size is None or s <= args.max_size]
+    results = []
+    print(f'{"method":<12}{"size":>10}{"overlap":>9}{"merge_ns":>16}{"peak_bytes":>14}{"lookup_ns":>11}')
+    for size in sizes:
+        for overlap in args.overlaps:
+            for row in bench(size, overlap, args.methods):
+                results.append(row)
+                print(f'{row["method"]:<12}{size:>10}{overlap:>9.0%}{row["merge_ns"]:>16.0f}'
+                      f'{row["peak_bytes"]:>14}{row["lookup_ns"]:>11.1f}', flush=True)
+
+    if args.output:
+        report = {
+            'python': sys.version,
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
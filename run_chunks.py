@@ -0,0 +1,221 @@
+# Runs the notes files chunk by chunk, the way the README says to read them.
+# A chunk is a run of code separated from the next by two or more blank lines.
+# Every chunk is executed in its own fresh namespace and its own fresh process, and its
+# result is cached on disk by content hash (chunk source + interpreter version).
+# Re-runs only execute chunks that changed, or everything after an interpreter upgrade.
+#
+# Usage:
+#   python run_chunks.py                   # All notes files
+#   python run_chunks.py LIST.py SET.py    # Only some of them
+#   python run_chunks.py --force -j 4      # Ignore the cache, use 4 processes
+#   python run_chunks.py -v                # Also print each chunk's output
+#   python run_chunks.py --timeout 60      # Fail any chunk that runs for more than 60 seconds
+
+import argparse
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+NOTES = ['DICT.py', 'LIST.py', 'SET.py', 'TUPLE.py', 'BYTES.py', 'TYPE_CASTING.py', 'NONETYPE.py']
+CACHE_FILE = '.chunk_cache.json'
+
+_BREAK = re.compile(r'\n(?:[ \t]*\n){2,}')   # Two or more blank lines
+
+
+def _ends_with_block(source):
+    # PEP 8 puts two blank lines after a def or class, which is spacing, not a chunk break.
+    try:
+        body = ast.parse(source).body
+    except SyntaxError:
+        return False
+    return bool(body) and isinstance(body[-1], (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+
+
+def split_chunks(text):
+    """Return a list of (first_line, source) pairs, one per chunk of text."""
+    chunks = []
+    pos = 0
+    line = 1
+    for match in [*_BREAK.finditer(text), None]:
+        end = match.start() if match else len(text)
+        source = text[pos:end]
+        if source.strip():
+            if chunks and _ends_with_block(chunks[-1][1]):
+                first, previous = chunks.pop()
+                gap = '\n' * (line - first - previous.count('\n'))
+                source = previous + gap + source
+                chunks.append((first, source))
+            else:
+                chunks.append((line, source))
+        if match:
+            line += text.count('\n', pos, match.end())
+            pos = match.end()
+    return chunks
+
+
+def chunk_key(source):
+    return hashlib.sha256(f'{sys.version}\0{source}'.encode()).hexdigest()
+
+
+class ChunkTimeout(BaseException):
+    # A BaseException, so a chunk's own `except Exception` can't swallow it.
+    pass
+
+
+def _alarm(signum, frame):
+    raise ChunkTimeout
+
+
+def run_chunk(path, first_line, source, timeout=None):
+    """Execute one chunk in a fresh namespace. Returns a JSON-friendly result dict."""
+    out = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    retry = False                             # Set for results that shouldn't be cached
+    timed = timeout and hasattr(signal, 'SIGALRM')   # No SIGALRM on Windows: no timeout there
+    try:
+        code = compile('\n' * (first_line - 1) + source, path, 'exec')
+        if timed:
+            signal.signal(signal.SIGALRM, _alarm)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+            exec(code, {'__name__': '__chunk__', '__file__': path})
+    except BaseException as exc:
+        tb = traceback.extract_tb(exc.__traceback__)
+        lineno = next((f.lineno for f in reversed(tb) if f.filename == path), getattr(exc, 'lineno', None))
+        error = {'line': lineno, 'message': ''.join(traceback.format_exception_only(exc)).strip()}
+        if isinstance(exc, ChunkTimeout):     # A slow machine may manage next time
+            error['message'] = f'ChunkTimeout: still running after {timeout} s'
+            retry = True
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result = {'ok': error is None, 'error': error, 'output': out.getvalue(),
+              'seconds': round(time.perf_counter() - start, 4)}
+    if retry:
+        result['retry'] = True
+    return result
+
+
+def _crashed(path, first_line):
+    return {'ok': False, 'error': {'line': first_line, 'message': 'the worker process died running this chunk'},
+            'output': '', 'seconds': 0, 'retry': True}
+
+
+def _pool(workers):
+    # One chunk per process: a chunk that patches a module, leaves a thread running or fills the
+    # interpreter's caches can't change what a later chunk sees. Spawned, not forked, so each
+    # process starts from a clean interpreter (max_tasks_per_child needs 3.11+).
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    return ProcessPoolExecutor(max_workers=workers)   # Older Pythons reuse their workers
+
+
+def run_pending(pending, workers=None, timeout=None, done=None):
+    """Run {key: (path, first_line, source)} on a process pool and return {key: result}.
+
+    A chunk that kills its worker (os._exit, a segfault) breaks the whole pool, and every chunk
+    still in it fails with BrokenProcessPool. Those are run again one process each, so only the
+    chunk that really crashed is reported. done(key, result) is called as each result comes in.
+    """
+    results = {}
+
+    def finish(key, result):
+        results[key] = result
+        if done:
+            done(key, result)
+
+    broken = []
+    with _pool(workers) as pool:
+        futures = {pool.submit(run_chunk, *job, timeout): key for key, job in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                finish(key, future.result())
+            except BrokenProcessPool:
+                broken.append(key)
+    for key in broken:
+        with _pool(1) as pool:
+            try:
+                finish(key, pool.submit(run_chunk, *pending[key], timeout).result())
+            except BrokenProcessPool:
+                finish(key, _crashed(*pending[key][:2]))
+    return results
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)                     # Never leave a half-written cache behind
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the notes files chunk by chunk.')
+    parser.add_argument('files', nargs='*', default=NOTES)
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache', default=CACHE_FILE, help=f'cache file (default: {CACHE_FILE})')
+    parser.add_argument('--force', action='store_true', help='ignore cached results')
+    parser.add_argument('-v', '--verbose', action='store_true', help="print each chunk's output")
+    parser.add_argument('--timeout', type=float, default=None, help='seconds before a chunk is failed (default: none)')
+    args = parser.parse_args(argv)
+
+    cache = {} if args.force else load_cache(args.cache)
+    jobs = []                                 # (path, first_line, key, source)
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            for first_line, source in split_chunks(f.read()):
+                jobs.append((path, first_line, chunk_key(source), source))
+
+    pending = {}                              # Identical chunks only run once
+    for path, first_line, key, source in jobs:
+        if key not in cache and key not in pending:
+            pending[key] = (path, first_line, source)
+
+    results = {}
+    if pending:
+        def done(key, result):
+            if not result.get('retry'):       # Crashes and timeouts are tried again next run
+                cache[key] = result
+
+        try:
+            results = run_pending(pending, args.jobs, args.timeout, done)
+        finally:                              # Keep whatever finished, even on Ctrl+C
+            save_cache(args.cache, cache)
+
+    failed = 0
+    for path, first_line, key, source in jobs:
+        result = results.get(key) or cache[key]
+        if args.verbose and result['output']:
+            print(f'--- {path}:{first_line}\n{result["output"]}', end='')
+        if not result['ok']:
+            failed += 1
+            error = result['error']
+            print(f'{path}:{error["line"] or first_line}: {error["message"].splitlines()[-1]}')
+
+    print(f'{len(jobs)} chunks, {len(pending)} executed, {len(jobs) - len(pending)} cached, {failed} failed')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())